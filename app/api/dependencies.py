@@ -1,6 +1,10 @@
+import time
+import threading
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 import jwt
 from jwt.exceptions import InvalidTokenError
 
@@ -12,10 +16,96 @@ from app.api.schemas import TokenData
 # Defines the "login" URL for Swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+class PrincipalCache:
+    """
+    In-process cache of authenticated users keyed by token subject (email),
+    so protected requests don't pay a users-table round-trip each.
+
+    - Entries expire after `ttl_seconds`; the least recently used entry is
+      evicted beyond `max_entries`.
+    - Cached users are detached from any session: read their columns only
+      (no lazy relationships).
+    - Updating or deleting a User through the ORM invalidates its entry once
+      the transaction commits (see the events below).
+
+    Each API worker process holds its own cache.
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = None):
+        self.ttl = Config.AUTH_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or Config.AUTH_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # subject -> (expires_at, user)
+
+    def get(self, subject):
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return entry[1]
+
+    def put(self, subject, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *subjects):
+        with self._lock:
+            for subject in subjects:
+                self._entries.pop(subject, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# Process-wide cache shared by all requests
+principal_cache = PrincipalCache()
+
+# --- CACHE INVALIDATION ---
+# A changed user (deactivated, email or password changed, deleted) is noted on
+# its session and dropped from the cache after COMMIT, so a concurrent request
+# can't re-cache the old row between the flush and the commit.
+_PENDING_KEY = "principal_invalidations"
+
+def _note_user_change(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate(target.email)
+        return
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    pending.add(target.email)
+    # The email may itself be what changed: drop the old key too
+    pending.update(inspect(target).attrs.email.history.deleted)
+
+@event.listens_for(Session, "after_commit")
+def _apply_user_invalidations(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        principal_cache.invalidate(*pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_user_invalidations(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+event.listen(User, "after_update", _note_user_change)
+event.listen(User, "after_delete", _note_user_change)
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """
     Decodes the JWT token to find the current user.
     If token is invalid or user doesn't exist, raises 401 Unauthorized.
+    Deactivated users get 403.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,9 +123,18 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except InvalidTokenError:
         raise credentials_exception
     
-    # Fetch user from DB
-    user = db.query(User).filter(User.email == token_data.email).first()
+    # Cached principal, or fetch user from DB
+    user = principal_cache.get(token_data.email)
     if user is None:
-        raise credentials_exception
+        user = db.query(User).filter(User.email == token_data.email).first()
+        if user is None:
+            raise credentials_exception
+        # Detach it: the cached object outlives this request's session
+        db.expunge(user)
+        if user.is_active is not False: # NULL (legacy rows) counts as active
+            principal_cache.put(token_data.email, user)
+
+    if user.is_active is False:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
         
     return user
@@ -0,0 +1,32 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from fastapi import HTTPException, status
+
+# --- KEYSET CURSORS ---
+# A cursor is the sort key of the last row on a page, as URL-safe base64 JSON.
+# The next page asks the database for rows strictly after that key, so deep
+# pages cost the same as the first one (no OFFSET scan).
+
+def encode_cursor(sort_value: datetime, row_id) -> str:
+    raw = json.dumps({"at": sort_value.isoformat(), "id": row_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str):
+    """Returns (sort datetime, row id). Raises 400 for a cursor we didn't issue."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["at"]), data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+def encode_id_cursor(row_id) -> str:
+    """Cursor for lists ordered by a plain id."""
+    return base64.urlsafe_b64encode(json.dumps({"id": row_id}).encode()).decode()
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
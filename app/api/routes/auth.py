@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -6,7 +7,7 @@ from datetime import timedelta
 from app.database.database import get_db
 from app.database.models import User
 from app.api.schemas import UserCreate, UserResponse, Token
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token, PasswordHasherBusy, password_hasher_busy
 from app.core.config import Config
 from app.api.dependencies import get_current_user 
 
@@ -15,19 +16,23 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
-@router.post("/signup", response_model=UserResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests right now. Please try again in a moment.",
+        headers={"Retry-After": "1"},
+    )
+
+def find_credentials(db: Session, email: str):
     """
-    Registers a new user. 
-    Checks if email already exists before creating.
+    (email, hashed_password, is_active) of a user, or None. Closes the
+    session right after, so its pooled connection isn't held while bcrypt runs.
     """
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Hash the password for security
-    hashed_password = get_password_hash(user.password)
-    
+    row = db.query(User.email, User.hashed_password, User.is_active).filter(User.email == email).first()
+    db.close()
+    return row
+
+def create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
     new_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -37,25 +42,62 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    
     return new_user
 
+# Login and signup are async: bcrypt runs in the password hashing pool and the
+# short DB calls in worker threads, so neither holds a slot of the threadpool
+# the sync routes share.
+
+@router.post("/signup", response_model=UserResponse)
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
+    """
+    Registers a new user. 
+    Checks if email already exists before creating.
+    """
+    if password_hasher_busy():
+        raise hasher_busy()
+
+    db_user = await asyncio.to_thread(find_credentials, db, user.email)
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Hash the password for security
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    
+    return await asyncio.to_thread(create_user, db, user, hashed_password)
+
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Authenticates a user and returns a JWT access token.
     FastAPI's OAuth2PasswordRequestForm expects 'username', 
     but we use 'email' for login.
     """
+    # Turned away before touching the DB while the hashing pool is full
+    if password_hasher_busy():
+        raise hasher_busy()
+
     # Find user by email (form_data.username contains the email)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await asyncio.to_thread(find_credentials, db, form_data.username)
+    
+    try:
+        valid = bool(user) and await verify_password_async(form_data.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Same rule as get_current_user: a disabled account gets no token
+    if user.is_active is False:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     
     # Generate Token
     access_token_expires = timedelta(minutes=Config.ACCESS_TOKEN_EXPIRE_MINUTES)
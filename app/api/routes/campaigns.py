@@ -1,27 +1,46 @@
-from collections import defaultdict
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, true, tuple_
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
-import json
 
 from app.database.database import get_db
-from app.database.models import Campaign, CampaignLead, Lead, User, Message
-from app.api.schemas import CampaignCreate, CampaignResponse, InboxResponse
+from app.database.models import Campaign, CampaignLead, CampaignStats, Lead, User, Message
+from app.api.schemas import CampaignCreate, CampaignResponse, InboxResponse, InboxConversation, CampaignPreviewRequest, CampaignPreviewResponse
+from app.api.pagination import encode_cursor, decode_cursor
 from app.api.dependencies import get_current_user
-from app.services.campaign_service import launch_campaign_task
+from app.services.templates import compile_template
+from app.utils.phone_numbers import primary_phone
 
 router = APIRouter(prefix="/api/campaigns", tags=["Campaigns"])
 
+# Characters of the last message shown in the inbox contact list
+INBOX_PREVIEW_CHARS = 160
+
+def campaign_summary(campaign: Campaign, stats: CampaignStats = None) -> dict:
+    """CampaignResponse fields from a campaign and its counters row."""
+    return {
+        "id": campaign.id,
+        "name": campaign.name,
+        "status": campaign.status,
+        "total_leads": stats.total if stats else 0,
+        "created_at": campaign.created_at,
+        "queued": stats.queued if stats else 0,
+        "sent": stats.sent if stats else 0,
+        "failed": stats.failed if stats else 0,
+        "replied": stats.replied if stats else 0,
+        "delivered": stats.delivered if stats else 0,
+        "total_cost": stats.total_cost if stats else 0.0
+    }
+
 @router.post("/start", response_model=CampaignResponse)
 def start_campaign(
     payload: CampaignCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Initializes a campaign and triggers background execution.
+    Initializes a campaign and queues its leads.
+    Sending is done by the campaign worker (python -m app.worker).
     """
     
     # 1. Validation
@@ -53,18 +72,45 @@ def start_campaign(
         )
         db.add(roster)
     
+    # Dashboard counters start with everything queued
+    stats = CampaignStats(campaign_id=new_campaign.id, total=len(valid_leads), queued=len(valid_leads))
+    db.add(stats)
+
+    # Committing the roster hands it to the worker queue
     db.commit()
 
-    # 4. Trigger Background Task
-    background_tasks.add_task(launch_campaign_task, new_campaign.id, db)
+    # 4. Return Response
+    return campaign_summary(new_campaign, stats)
+
+@router.post("/preview", response_model=CampaignPreviewResponse)
+def preview_campaign(
+    payload: CampaignPreviewRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Renders the template for the first `sample_size` leads exactly as the
+    worker would. Nothing is saved and nothing is sent.
+    """
+    template = compile_template(payload.template_body)
+
+    sample_ids = payload.lead_ids[:payload.sample_size]
+    leads = {l.radar_id: l for l in db.query(Lead).filter(Lead.radar_id.in_(sample_ids)).all()}
+    sample = [leads[lead_id] for lead_id in sample_ids if lead_id in leads]
+
+    bodies = template.render_many(sample)
 
-    # 5. Return Response
     return {
-        "id": new_campaign.id,
-        "name": new_campaign.name,
-        "status": new_campaign.status,
-        "total_leads": len(valid_leads),
-        "created_at": new_campaign.created_at
+        "fields": template.fields,
+        "unknown_fields": template.unknown_fields,
+        "previews": [
+            {
+                "lead_id": lead.radar_id,
+                "owner_name": lead.owner_name,
+                "phone_number": primary_phone(lead.phone_numbers),
+                "body": body
+            }
+            for lead, body in zip(sample, bodies)
+        ]
     }
 
 @router.get("/", response_model=List[CampaignResponse])
@@ -73,20 +119,14 @@ def get_user_campaigns(
     current_user: User = Depends(get_current_user)
 ):
     """Retrieves all campaigns associated with the current user."""
-    campaigns = db.query(Campaign).filter(Campaign.user_id == current_user.id).order_by(Campaign.created_at.desc()).all()
-    
-    results = []
-    for c in campaigns:
-        count = db.query(CampaignLead).filter(CampaignLead.campaign_id == c.id).count()
-        results.append({
-            "id": c.id,
-            "name": c.name,
-            "status": c.status,
-            "total_leads": count,
-            "created_at": c.created_at
-        })
-        
-    return results
+    # One query: each campaign with its counters row
+    rows = db.query(Campaign, CampaignStats)\
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)\
+        .filter(Campaign.user_id == current_user.id)\
+        .order_by(Campaign.created_at.desc())\
+        .all()
+
+    return [campaign_summary(c, stats) for c, stats in rows]
 
 # --- NEW: ARCHIVE ENDPOINT ---
 @router.put("/{campaign_id}/archive", response_model=CampaignResponse)
@@ -117,15 +157,7 @@ def archive_campaign(
     db.commit()
     db.refresh(campaign)
     
-    count = db.query(CampaignLead).filter(CampaignLead.campaign_id == campaign.id).count()
-    
-    return {
-        "id": campaign.id,
-        "name": campaign.name,
-        "status": campaign.status,
-        "total_leads": count,
-        "created_at": campaign.created_at
-    }
+    return campaign_summary(campaign, campaign.stats)
 
 # --- NEW: DELETE ENDPOINT (Optional but recommended for cleanup) ---
 @router.delete("/{campaign_id}", status_code=204)
@@ -148,85 +180,137 @@ def delete_campaign(
     # Manual Cascade
     db.query(CampaignLead).filter(CampaignLead.campaign_id == campaign_id).delete()
     db.query(Message).filter(Message.campaign_id == campaign_id).delete()
+    db.query(CampaignStats).filter(CampaignStats.campaign_id == campaign_id).delete()
     
     db.delete(campaign)
     db.commit()
     
     return None
 
-# --- INBOX / CONVERSATION ENDPOINT ---
+# --- INBOX / CONVERSATION ENDPOINTS ---
+
+def get_owned_campaign(db: Session, campaign_id: int, user: User) -> Campaign:
+    campaign = db.query(Campaign).filter(
+        Campaign.id == campaign_id,
+        Campaign.user_id == user.id
+    ).first()
+
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
 
 @router.get("/{campaign_id}/inbox", response_model=InboxResponse)
 def get_campaign_inbox(
     campaign_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Fetches the full 'Chat Interface' data for a specific campaign.
+    One page of the 'Contact List': a summary per lead (last message preview
+    and last activity), most recent activity first. Pass 'next_cursor' back as
+    'cursor' for the next page. Full threads come from /inbox/{lead_id}.
     """
-    
+
     # 1. Security
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.user_id == current_user.id
-    ).first()
-    
-    if not campaign:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+    campaign = get_owned_campaign(db, campaign_id, current_user)
 
-    # 2. Fetch Roster
-    roster_items = db.query(CampaignLead).filter(
-        CampaignLead.campaign_id == campaign_id
-    ).all()
+    # 2. Roster page, sorted and paged by the stored last activity: a range
+    #    scan of ix_campaign_leads_campaign_activity, however deep the page
+    query = db.query(CampaignLead.id, CampaignLead.lead_id, CampaignLead.status, CampaignLead.last_activity_at)\
+        .filter(CampaignLead.campaign_id == campaign_id)
 
-    # 3. Fetch Messages
-    all_messages = db.query(Message).filter(
-        Message.campaign_id == campaign_id
-    ).order_by(Message.created_at.asc()).all()
+    if cursor:
+        after_activity, after_id = decode_cursor(cursor)
+        query = query.filter(tuple_(CampaignLead.last_activity_at, CampaignLead.id) < tuple_(after_activity, after_id))
 
-    # 4. Group Messages
-    msg_map = defaultdict(list)
-    for msg in all_messages:
-        msg_map[msg.lead_id].append(msg)
+    page = query.order_by(CampaignLead.last_activity_at.desc(), CampaignLead.id.desc()).limit(limit + 1).subquery()
 
-    # 5. Build Objects
-    conversations = []
-    
-    for item in roster_items:
-        lead = item.lead
-        msgs = msg_map.get(lead.radar_id, [])
-        
-        display_phone = None
-        if lead.phone_numbers:
-            phones = lead.phone_numbers
-            if isinstance(phones, str):
-                try: phones = json.loads(phones)
-                except: phones = []
-            if isinstance(phones, list) and phones:
-                display_phone = phones[0]
-
-        last_active = None
-        if msgs:
-            last_active = msgs[-1].created_at
-        else:
-            last_active = campaign.created_at
-
-        conversations.append({
-            "lead_id": lead.radar_id,
-            "owner_name": lead.owner_name,
-            "address": lead.address,
-            "phone_number": display_phone,
-            "status": item.status,
-            "messages": msgs,
-            "last_activity_at": last_active
-        })
-
-    # 6. Sort
-    conversations.sort(key=lambda x: x["last_activity_at"] or datetime.min, reverse=True)
+    # 3. Last message of each roster row on the page (one index probe per row)
+    last_message = select(
+        func.substr(Message.body, 1, INBOX_PREVIEW_CHARS).label("body"),
+        Message.direction
+    ).where(
+        Message.campaign_id == campaign_id,
+        Message.lead_id == page.c.lead_id
+    ).order_by(Message.created_at.desc(), Message.id.desc()).limit(1).lateral("last_message")
+
+    rows = db.query(
+        page.c.id,
+        page.c.status,
+        Lead.radar_id,
+        Lead.owner_name,
+        Lead.address,
+        Lead.phone_numbers,
+        last_message.c.body,
+        last_message.c.direction,
+        page.c.last_activity_at
+    ).join(Lead, Lead.radar_id == page.c.lead_id)\
+     .outerjoin(last_message, true())\
+     .order_by(page.c.last_activity_at.desc(), page.c.id.desc()).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].last_activity_at, rows[-1].id)
+
+    total = db.query(func.count(CampaignLead.id)).filter(CampaignLead.campaign_id == campaign_id).scalar()
 
     return {
         "campaign_id": campaign.id,
         "campaign_name": campaign.name,
-        "conversations": conversations
-    }
\ No newline at end of file
+        "total_leads": total,
+        "next_cursor": next_cursor,
+        "conversations": [
+            {
+                "lead_id": row.radar_id,
+                "owner_name": row.owner_name,
+                "address": row.address,
+                "phone_number": primary_phone(row.phone_numbers),
+                "status": row.status,
+                "last_message": row.body,
+                "last_direction": row.direction,
+                "last_activity_at": row.last_activity_at
+            }
+            for row in rows
+        ]
+    }
+
+@router.get("/{campaign_id}/inbox/{lead_id}", response_model=InboxConversation)
+def get_campaign_thread(
+    campaign_id: int,
+    lead_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    The full chat history with one lead in this campaign.
+    """
+    campaign = get_owned_campaign(db, campaign_id, current_user)
+
+    row = db.query(CampaignLead.status, Lead).join(Lead, Lead.radar_id == CampaignLead.lead_id).filter(
+        CampaignLead.campaign_id == campaign_id,
+        CampaignLead.lead_id == lead_id
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Lead is not part of this campaign")
+    roster_status, lead = row
+
+    msgs = db.query(Message).filter(
+        Message.campaign_id == campaign_id,
+        Message.lead_id == lead_id
+    ).order_by(Message.created_at.asc(), Message.id.asc()).all()
+
+    return {
+        "lead_id": lead.radar_id,
+        "owner_name": lead.owner_name,
+        "address": lead.address,
+        "phone_number": primary_phone(lead.phone_numbers),
+        "status": roster_status,
+        "messages": msgs,
+        "last_message": msgs[-1].body if msgs else None,
+        "last_direction": msgs[-1].direction if msgs else None,
+        "last_activity_at": msgs[-1].created_at if msgs else campaign.created_at
+    }
@@ -0,0 +1,144 @@
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, or_
+from sqlalchemy.orm import Session
+
+from app.database.database import get_db, SessionLocal
+from app.database.models import SearchHistory, SearchResult, Lead, User
+from app.api.dependencies import get_current_user
+from app.utils.file_manager import export_columns, iter_csv, write_xlsx
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["Export"]
+)
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+# Bytes per chunk when sending a finished .xlsx
+XLSX_CHUNK_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Raw keys rebuilt from the lead columns when a lead has no raw_property_data
+FALLBACK_KEYS = ['Address', 'City', 'State', 'ZipFive', 'Beds', 'Baths', 'SqFt', 'YearBuilt',
+                 'LotSqFt', 'PType', 'AVM', 'AvailableEquity', 'inTaxDelinquency', 'Persons']
+
+def has_raw_record():
+    return func.json_typeof(Lead.raw_property_data) == "object"
+
+def lead_record(row) -> dict:
+    """The PropertyRadar record for an export row (rebuilt from columns for older leads)."""
+    if isinstance(row.raw_property_data, dict):
+        return row.raw_property_data
+    return {
+        "Address": row.address, "City": row.city, "State": row.state, "ZipFive": row.zip_code,
+        "Beds": row.beds, "Baths": row.baths, "SqFt": row.sq_ft, "YearBuilt": row.year_built,
+        "LotSqFt": row.lot_sq_ft, "PType": row.property_type,
+        "AVM": row.estimated_value, "AvailableEquity": row.estimated_equity,
+        "inTaxDelinquency": row.tax_delinquent,
+        "Persons": [{
+            "EntityName": row.owner_name,
+            "Phone": row.phone_numbers if isinstance(row.phone_numbers, list) else [],
+            "Email": row.email_addresses if isinstance(row.email_addresses, list) else [],
+        }],
+    }
+
+def search_columns(db: Session, search_id: int):
+    """
+    Export columns for a search: the union of its records' keys and the
+    largest owner count, both collected by Postgres.
+    """
+    in_search = select(SearchResult.lead_id).where(SearchResult.search_id == search_id)
+
+    keys = db.execute(
+        select(func.json_object_keys(Lead.raw_property_data)).distinct()
+        .where(Lead.radar_id.in_(in_search), has_raw_record())
+    ).scalars().all()
+
+    persons = Lead.raw_property_data['Persons']
+    owners = db.execute(
+        select(func.max(func.json_array_length(persons)))
+        .where(Lead.radar_id.in_(in_search), has_raw_record(), func.json_typeof(persons) == "array")
+    ).scalar() or 0
+
+    missing_raw = db.execute(
+        select(Lead.radar_id)
+        .where(Lead.radar_id.in_(in_search), or_(Lead.raw_property_data.is_(None), ~has_raw_record()))
+        .limit(1)
+    ).first()
+    if missing_raw:
+        # Rebuilt records always carry one owner
+        keys = set(keys) | set(FALLBACK_KEYS)
+        owners = max(owners, 1)
+
+    return export_columns(keys, owners)
+
+def stream_search_records(search_id: int):
+    """
+    Yields one raw record per lead of the search, in result order, from a
+    server-side cursor. Uses its own session: the request's session is closed
+    before a streaming body is sent.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            Lead.raw_property_data, Lead.address, Lead.city, Lead.state, Lead.zip_code,
+            Lead.beds, Lead.baths, Lead.sq_ft, Lead.year_built, Lead.lot_sq_ft, Lead.property_type,
+            Lead.estimated_value, Lead.estimated_equity, Lead.tax_delinquent,
+            Lead.owner_name, Lead.phone_numbers, Lead.email_addresses
+        ).join(SearchResult, SearchResult.lead_id == Lead.radar_id)\
+         .filter(SearchResult.search_id == search_id)\
+         .order_by(SearchResult.id)\
+         .execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        for row in rows:
+            yield lead_record(row)
+    finally:
+        db.close()
+
+def stream_xlsx(records, columns):
+    """Builds the workbook in a temp file, then sends it in chunks."""
+    with tempfile.TemporaryFile() as tmp:
+        write_xlsx(records, columns, tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(XLSX_CHUNK_BYTES):
+            yield chunk
+
+@router.get("/search/{search_id}")
+def export_search(
+    search_id: int,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Downloads every lead of a search as CSV or Excel, with the same columns
+    and formatting as the spreadsheet export. Rows are streamed from the
+    database, so memory use doesn't grow with the size of the search.
+    """
+    search = db.query(SearchHistory.id, SearchHistory.user_id).filter(SearchHistory.id == search_id).first()
+
+    if not search:
+        raise HTTPException(status_code=404, detail="Search history not found")
+
+    if search.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to export this search."
+        )
+
+    columns = search_columns(db, search_id)
+    records = stream_search_records(search_id)
+    body = iter_csv(records, columns) if format == "csv" else stream_xlsx(records, columns)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="search_{search_id}.{format}"'}
+    )
@@ -1,20 +1,28 @@
 import json
-import ast
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List
 
-from app.database.database import get_db
-from app.database.models import SearchHistory, User # Added User
+from app.database.database import get_db, SessionLocal
+from app.database.models import SearchHistory, SearchResult, Lead, User # Added User
+from app.api.pagination import encode_id_cursor, decode_id_cursor
 from app.api.schemas import SearchHistoryResponse, LeadResponse
 from app.api.dependencies import get_current_user # Added Security Dependency
+from app.utils.db_lists import parse_db_list
 
 router = APIRouter(
     prefix="/api/history",
     tags=["History & Leads"]
 )
 
+# Rows fetched per round-trip while streaming NDJSON
+NDJSON_BATCH_SIZE = 1000
+
+# Page size when a cursor is passed without a limit
+DEFAULT_PAGE_SIZE = 500
+
 @router.get("/", response_model=List[SearchHistoryResponse])
 def get_all_history(
     db: Session = Depends(get_db),
@@ -28,14 +36,94 @@ def get_all_history(
         .order_by(desc(SearchHistory.created_at))\
         .all()
 
+# Columns the lead list needs (never the raw_property_data blob)
+LEAD_LIST_COLUMNS = (
+    SearchResult.id, Lead.radar_id, Lead.address, Lead.city, Lead.state, Lead.owner_name,
+    Lead.estimated_equity, Lead.estimated_value, Lead.beds, Lead.baths, Lead.sq_ft,
+    Lead.year_built, Lead.phone_numbers, Lead.email_addresses
+)
+
+def format_leads(rows) -> list:
+    """
+    A batch of LEAD_LIST_COLUMNS rows -> LeadResponse dicts. Lists stored as
+    JSON arrays pass straight through; legacy string-encoded lists are parsed
+    once per distinct value in the batch.
+    """
+    parsed = {}
+
+    def as_list(value):
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str):
+            if value not in parsed:
+                parsed[value] = parse_db_list(value)
+            return parsed[value]
+        return parse_db_list(value)
+
+    return [
+        {
+            "radar_id": row.radar_id,
+            "address": row.address if row.address else "N/A",
+            "city": row.city if row.city else "",
+            "state": row.state if row.state else "",
+            "owner_name": row.owner_name,
+            "is_purchased": True,
+            "equity_value": row.estimated_equity,
+            "estimated_value": row.estimated_value,
+            "beds": row.beds,
+            "baths": row.baths,
+            "sq_ft": row.sq_ft,
+            "year_built": row.year_built,
+            "phone_numbers": as_list(row.phone_numbers),
+            "emails": as_list(row.email_addresses)
+        }
+        for row in rows
+    ]
+
+def search_leads_query(db: Session, search_id: int, after_id: int = None):
+    """One joined query over a search's results, in result order (keyset on SearchResult.id)."""
+    query = db.query(*LEAD_LIST_COLUMNS)\
+        .join(Lead, Lead.radar_id == SearchResult.lead_id)\
+        .filter(SearchResult.search_id == search_id)
+    if after_id is not None:
+        query = query.filter(SearchResult.id > after_id)
+    return query.order_by(SearchResult.id)
+
+def stream_ndjson(search_id: int, after_id: int = None):
+    """
+    Yields JSON lines (one per lead) a batch of NDJSON_BATCH_SIZE rows at a
+    time from a server-side cursor, so memory stays flat however large the
+    search is. Uses its own session: the request's session is closed before
+    a streaming body is sent.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            search_leads_query(db, search_id, after_id).statement.execution_options(yield_per=NDJSON_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            yield "".join(json.dumps(lead, default=str) + "\n" for lead in format_leads(rows))
+    finally:
+        db.close()
+
 @router.get("/{search_id}", response_model=List[LeadResponse])
 def get_leads_for_search(
     search_id: int, 
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=5000),
+    cursor: str | None = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user) # <--- Security Injection
 ):
+    """
+    Leads found by one search. Without `limit` or `cursor` the whole list is
+    returned; otherwise one page of `limit` (default 500), with the next
+    page's cursor in the X-Next-Cursor header (absent on the last page).
+    With format=ndjson every remaining lead is streamed as JSON lines instead.
+    """
     # 1. Find the search
-    search = db.query(SearchHistory).filter(SearchHistory.id == search_id).first()
+    search = db.query(SearchHistory.id, SearchHistory.user_id).filter(SearchHistory.id == search_id).first()
 
     if not search:
         raise HTTPException(status_code=404, detail="Search history not found")
@@ -47,38 +135,22 @@ def get_leads_for_search(
             detail="You are not authorized to view this search."
         )
 
-    formatted_leads = []
+    after_id = decode_id_cursor(cursor) if cursor else None
 
-    # Robust parser for mixed data types (JSON string vs Python list vs Text)
-    def parse_list(value):
-        if not value: return []
-        if isinstance(value, list): return value
-        if isinstance(value, str):
-            value = value.strip()
-            try: return json.loads(value)
-            except: pass
-            try: return ast.literal_eval(value)
-            except: pass
-            return [value]
-        return []
-
-    for result in search.results:
-        lead = result.lead
-        formatted_leads.append({
-            "radar_id": lead.radar_id,
-            "address": lead.address if lead.address else "N/A",
-            "city": lead.city if lead.city else "",
-            "state": lead.state if lead.state else "",
-            "owner_name": lead.owner_name,
-            "is_purchased": True,
-            "equity_value": lead.estimated_equity,
-            "estimated_value": lead.estimated_value,
-            "beds": lead.beds,
-            "baths": lead.baths,
-            "sq_ft": lead.sq_ft,
-            "year_built": lead.year_built,
-            "phone_numbers": parse_list(lead.phone_numbers),
-            "emails": parse_list(lead.email_addresses) 
-        })
-
-    return formatted_leads
+    # 3a. Streaming: the whole (remaining) list, one lead per line
+    if format == "ndjson":
+        return StreamingResponse(stream_ndjson(search_id, after_id), media_type="application/x-ndjson")
+
+    # 3b. Every lead (unpaginated callers)
+    query = search_leads_query(db, search_id, after_id)
+    if limit is None and cursor is None:
+        return format_leads(query.all())
+
+    # 3c. One page
+    limit = limit or DEFAULT_PAGE_SIZE
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_id_cursor(rows[-1].id)
+
+    return format_leads(rows)
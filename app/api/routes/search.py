@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.database.models import User
 from app.api.schemas import ScanRequest, ScanSummary, EnrichRequest, EnrichResult
-from app.domain.harvest import scan_target_area, enrich_target_leads
+from app.domain.harvest import scan_target_area, enrich_target_leads_async
 from app.api.dependencies import get_current_user # Added Security Dependency
 
 # Create the Router
@@ -41,17 +41,18 @@ def run_scan_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/enrich", response_model=EnrichResult)
-def run_enrich_endpoint(
+async def run_enrich_endpoint(
     payload: EnrichRequest,
     current_user: User = Depends(get_current_user) # <--- Security Injection
 ):
     """
     Step 2: The Buyer.
     Receives a list of IDs -> Buys and Saves them.
+    Runs on the event loop, so a slow enrichment no longer pins a threadpool worker.
     """
     try:
         # Pass user here too, in case enrichment needs to check ownership or log costs
-        result = enrich_target_leads(
+        result = await enrich_target_leads_async(
             payload.radar_ids, 
             payload.state, 
             payload.city, 
@@ -61,7 +62,7 @@ def run_enrich_endpoint(
         
         return EnrichResult(
             status="success", 
-            saved_count=result.get("saved", 0)
+            saved_count=result.get("saved_count", 0)
         )
         
     except Exception as e:
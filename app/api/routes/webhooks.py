@@ -6,44 +6,69 @@ from twilio.request_validator import RequestValidator
 from app.database.database import get_db
 from app.core.config import Config
 from app.services.message_service import handle_inbound_sms
+from app.services.status_callbacks import status_buffer
 
 router = APIRouter(prefix="/api/webhooks", tags=["Webhooks"])
 
-@router.post("/twilio/sms")
-async def twilio_sms_webhook(request: Request, db: Session = Depends(get_db)):
+async def verify_twilio_request(request: Request) -> dict:
     """
-    Receives incoming SMS from Twilio.
-    Validates signature to ensure security.
+    Returns the webhook's form data after checking its X-Twilio-Signature.
+    Raises 403 if the signature doesn't match.
     """
-    
     # 1. Get the Data (Twilio sends Form Data, NOT JSON)
     form_data = await request.form()
     data = dict(form_data)
-    
+
     # 2. Security Check (Signature Validation)
     # Twilio sends the signature in the header
     signature = request.headers.get("X-Twilio-Signature", "")
-    
+
     # We need the exact URL Twilio thinks it hit.
     # Twilio usually forwards 'X-Forwarded-Proto'.
     url = str(request.url)
-    
+
     # FIX for ngrok: If your API sees 'http' but ngrok is 'https', validation fails.
     if "ngrok" in url and url.startswith("http://"):
         url = url.replace("http://", "https://")
 
     # Use the Auth Token from your Config
     validator = RequestValidator(Config.TWILIO_TOKEN)
-    
+
     # Validate
     if not validator.validate(url, data, signature):
         # We raise 403 Forbidden if the signature doesn't match
         # print(f"DEBUG: Sig Failed! URL: {url} | Sig: {signature}") # Uncomment to debug
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid Twilio Signature")
 
+    return data
+
+@router.post("/twilio/sms")
+async def twilio_sms_webhook(request: Request, db: Session = Depends(get_db)):
+    """
+    Receives incoming SMS from Twilio.
+    Validates signature to ensure security.
+    """
+    data = await verify_twilio_request(request)
+
     # 3. Process Logic
     handle_inbound_sms(data, db)
     
     # 4. Return TwiML
     # Return empty XML so Twilio doesn't auto-reply to the user
-    return Response(content="<?xml version=\"1.0\" encoding=\"UTF-8\"?><Response></Response>", media_type="application/xml")
\ No newline at end of file
+    return Response(content="<?xml version=\"1.0\" encoding=\"UTF-8\"?><Response></Response>", media_type="application/xml")
+
+@router.post("/twilio/status", status_code=204)
+async def twilio_status_webhook(request: Request):
+    """
+    Receives delivery status callbacks for outbound messages.
+    Only buffers them in memory; the status flusher writes them in batches.
+    """
+    data = await verify_twilio_request(request)
+
+    status_buffer.add(
+        data.get("MessageSid"),
+        data.get("MessageStatus") or data.get("SmsStatus"),
+        error_code=data.get("ErrorCode"),
+        price=data.get("Price")
+    )
+    return Response(status_code=204)
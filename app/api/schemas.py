@@ -132,6 +132,28 @@ class CampaignCreate(BaseModel):
     template_body: str  # e.g. "Hi {name}, saw your home at {address}..."
     lead_ids: List[str] # The specific Radar IDs to target
 
+class CampaignPreviewRequest(BaseModel):
+    """
+    A template to try out against some of the leads before starting the campaign.
+    """
+    template_body: str  # e.g. "Hi {name}, your {equity|equity} at {address}..."
+    lead_ids: List[str]
+    sample_size: int = Field(5, ge=1, le=50)
+
+class CampaignPreview(BaseModel):
+    lead_id: str
+    owner_name: str | None = None
+    phone_number: str | None = None
+    body: str
+
+class CampaignPreviewResponse(BaseModel):
+    """
+    The rendered sample. 'unknown_fields' are {placeholders} that will be sent as typed.
+    """
+    fields: List[str]
+    unknown_fields: List[str]
+    previews: List[CampaignPreview]
+
 class CampaignResponse(BaseModel):
     """
     What the API returns immediately (before sending finishes).
@@ -142,6 +164,14 @@ class CampaignResponse(BaseModel):
     total_leads: int
     created_at: datetime
 
+    # Counters (campaign_stats)
+    queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    replied: int = 0
+    delivered: int = 0
+    total_cost: float = 0.0
+
     class Config:
         from_attributes = True
 
@@ -193,7 +223,8 @@ class InboxMessage(BaseModel):
 class InboxConversation(BaseModel):
     """
     Represents one item in the 'Contact List' (Left side of screen).
-    Contains the Lead info and their full chat history.
+    The inbox page only carries the last message; the thread endpoint
+    fills 'messages' with the full chat history.
     """
     lead_id: str
     owner_name: str | None = None
@@ -201,16 +232,22 @@ class InboxConversation(BaseModel):
     phone_number: str | None = None # The primary number we are texting
     status: str | None = "queued"   # Status in this campaign
     
-    # The Chat History
+    # The Chat History (thread endpoint only)
     messages: List[InboxMessage] = []
+
+    # Preview of the latest message
+    last_message: str | None = None
+    last_direction: str | None = None
     
     # Helper for sorting: When was the last activity?
     last_activity_at: datetime | None = None
 
 class InboxResponse(BaseModel):
     """
-    The full payload for the Campaign Inbox page.
+    One page of the Campaign Inbox, most recent activity first.
     """
     campaign_id: int
     campaign_name: str
+    total_leads: int = 0
+    next_cursor: str | None = None  # Pass back as ?cursor= for the next page
     conversations: List[InboxConversation]
@@ -9,11 +9,85 @@ class Config:
     # --- External APIs ---
     PROPERTY_RADAR_TOKEN = os.getenv("PROPERTY_RADAR_API_TOKEN")
 
+    # PropertyRadar HTTP transport (one pooled keep-alive session per process)
+    PROPERTY_RADAR_POOL_SIZE = int(os.getenv("PROPERTY_RADAR_POOL_SIZE", "10"))
+    PROPERTY_RADAR_CONNECT_TIMEOUT = float(os.getenv("PROPERTY_RADAR_CONNECT_TIMEOUT", "5"))
+    PROPERTY_RADAR_READ_TIMEOUT = float(os.getenv("PROPERTY_RADAR_READ_TIMEOUT", "30"))
+    PROPERTY_RADAR_MAX_RETRIES = int(os.getenv("PROPERTY_RADAR_MAX_RETRIES", "3"))
+
+    # Shared token bucket for every PropertyRadar call (adapts to 429s)
+    PROPERTY_RADAR_RATE_PER_SECOND = float(os.getenv("PROPERTY_RADAR_RATE_PER_SECOND", "5"))
+    PROPERTY_RADAR_BURST = float(os.getenv("PROPERTY_RADAR_BURST", "10"))
+
+    # Scanner list registry: how long a cached ListID is trusted, and how often
+    # the background job re-checks the registry against PropertyRadar
+    LIST_REGISTRY_TTL_MINUTES = int(os.getenv("LIST_REGISTRY_TTL_MINUTES", "1440"))
+    LIST_REGISTRY_RECONCILE_MINUTES = int(os.getenv("LIST_REGISTRY_RECONCILE_MINUTES", "60"))
+
+    # Scanner: how many scanned IDs go into one owned-lead IN (...) lookup
+    SCAN_DIFF_CHUNK_SIZE = int(os.getenv("SCAN_DIFF_CHUNK_SIZE", "1000"))
+
+    # Scanner: delta scans fetch only items added since the list's watermark;
+    # a full re-download still happens this often to drop items that left the list
+    SCAN_FULL_REFRESH_HOURS = int(os.getenv("SCAN_FULL_REFRESH_HOURS", "24"))
+
+    # Scanner: how long a scan summary is served from the in-process cache
+    SCAN_CACHE_TTL_SECONDS = int(os.getenv("SCAN_CACHE_TTL_SECONDS", "300"))
+
+    # Enrichment: how many leads may be in flight against PropertyRadar at once
+    ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "8"))
+
+    # Bulk ingest: leads written per INSERT ... ON CONFLICT transaction
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "200"))
+
     # Twilio
     TWILIO_SID = os.getenv("TWILIO_ACCOUNT_SID")
     TWILIO_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
     TWILIO_PHONE = os.getenv("TWILIO_PHONE_NUMBER")
 
+    # Twilio HTTP transport (one pooled client per process, see twilio_gateway.py).
+    # TWILIO_ASYNC also opens an aiohttp-based transport for async callers.
+    TWILIO_POOL_SIZE = int(os.getenv("TWILIO_POOL_SIZE", "10"))
+    TWILIO_TIMEOUT = float(os.getenv("TWILIO_TIMEOUT", "10"))
+    TWILIO_ASYNC = os.getenv("TWILIO_ASYNC", "false").lower() == "true"
+
+    # Delivery status callbacks: public URL of /api/webhooks/twilio/status (sent
+    # with every message when set), how often buffered callbacks are written,
+    # buffer size that triggers an early write, and how many flushes a callback
+    # for a not-yet-saved message is kept before it's dropped
+    TWILIO_STATUS_CALLBACK_URL = os.getenv("TWILIO_STATUS_CALLBACK_URL")
+    STATUS_FLUSH_SECONDS = float(os.getenv("STATUS_FLUSH_SECONDS", "2"))
+    STATUS_FLUSH_MAX = int(os.getenv("STATUS_FLUSH_MAX", "500"))
+    STATUS_RETRY_FLUSHES = int(os.getenv("STATUS_RETRY_FLUSHES", "5"))
+
+    # Campaign sending: messages per second for the whole account (raise it for
+    # short codes / messaging services), concurrent send workers, 429 retries.
+    # The rate is enforced per process, so each process gets an even share:
+    # set SMS_SENDING_PROCESSES to the number of campaign workers running.
+    SMS_RATE_PER_SECOND = float(os.getenv("SMS_RATE_PER_SECOND", "5"))
+    SMS_SENDING_PROCESSES = max(1, int(os.getenv("SMS_SENDING_PROCESSES", "1")))
+    SMS_SEND_WORKERS = int(os.getenv("SMS_SEND_WORKERS", "4"))
+    SMS_MAX_RETRIES = int(os.getenv("SMS_MAX_RETRIES", "2"))
+
+    # Campaign worker (python -m app.worker): roster rows claimed per batch, idle
+    # poll interval, and how long a claim may stay 'sending' before it's treated
+    # as abandoned by a crashed worker (keep well above batch size / SMS rate)
+    CAMPAIGN_CLAIM_BATCH_SIZE = int(os.getenv("CAMPAIGN_CLAIM_BATCH_SIZE", "50"))
+    CAMPAIGN_POLL_SECONDS = float(os.getenv("CAMPAIGN_POLL_SECONDS", "2"))
+    CAMPAIGN_CLAIM_LEASE_MINUTES = int(os.getenv("CAMPAIGN_CLAIM_LEASE_MINUTES", "15"))
+
+    # Campaign worker: send outcomes written per bulk INSERT/UPDATE + commit.
+    # Rows stay 'sending' until flushed, so a crash can only affect this many.
+    CAMPAIGN_FLUSH_SIZE = int(os.getenv("CAMPAIGN_FLUSH_SIZE", "25"))
+
+    # --- Analytics snapshot (partitioned Parquet, see scripts/export_lead_snapshot.py) ---
+    SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots/leads")
+    # Leads read from the server-side cursor / written per Arrow record batch
+    SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "20000"))
+    # Only export changes older than this, so a write committing late (its
+    # updated_at is its transaction start) still lands in the next run
+    SNAPSHOT_LAG_SECONDS = int(os.getenv("SNAPSHOT_LAG_SECONDS", "300"))
+
     # --- Database ---
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
@@ -26,6 +100,19 @@ class Config:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 Hours
 
+    # Auth: users resolved from tokens are cached per process (keyed by the
+    # token subject) for this long. Deactivating a user through the ORM drops
+    # the entry at once; other processes see it within the TTL. 0 disables.
+    AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+    AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "1024"))
+
+    # bcrypt for login/signup runs in its own process pool (app/core/security.py).
+    # Requests beyond workers + queue depth are turned away with a 503. Workers
+    # run niced so request handling keeps priority on shared cores.
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", "16"))
+    PASSWORD_HASH_NICE = int(os.getenv("PASSWORD_HASH_NICE", "10"))
+
     @staticmethod
     def validate():
         if not Config.PROPERTY_RADAR_TOKEN:
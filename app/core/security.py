@@ -1,3 +1,8 @@
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union
 from passlib.context import CryptContext
@@ -15,6 +20,118 @@ def get_password_hash(password: str) -> str:
     """Generates a secure hash from a plain password."""
     return pwd_context.hash(password)
 
+# --- PASSWORD HASHING POOL ---
+# bcrypt costs a few hundred ms of CPU per call on purpose. Login and signup
+# run it in a small dedicated process pool instead of inline, so a burst of
+# logins neither holds the GIL nor ties up the threadpool every sync route
+# (search, campaigns, history) runs on. At most workers + queue depth jobs
+# are admitted; past that callers get PasswordHasherBusy (-> 503) instead of
+# waiting in an unbounded queue.
+
+class PasswordHasherBusy(Exception):
+    """The hashing pool already has as many jobs as it admits."""
+
+def _init_worker(nice):
+    # Lower CPU priority: where hashing and request handling share cores,
+    # request handling wins and bcrypt waits
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+
+def _worker_ready() -> int:
+    # Imports this module (passlib + bcrypt) in the worker
+    return os.getpid()
+
+class PasswordHasher:
+    """
+    Bounded process pool for bcrypt. `verify` / `hash` are awaited from the
+    event loop. Workers are spawned (not forked), so they don't inherit the
+    API's threads, DB connections or sockets.
+    """
+
+    def __init__(self, workers=None, queue_depth=None):
+        self.workers = workers or Config.PASSWORD_HASH_WORKERS
+        queue_depth = Config.PASSWORD_HASH_QUEUE_DEPTH if queue_depth is None else queue_depth
+        self.max_pending = self.workers + queue_depth
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(Config.PASSWORD_HASH_NICE,)
+        )
+
+    def warm_up(self):
+        """Starts every worker now, so the first logins don't pay for process startup."""
+        for future in [self._pool.submit(_worker_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def busy(self) -> bool:
+        """True when a new job would be turned away (lets callers skip other work first)."""
+        return self.pending >= self.max_pending
+
+    def _release(self, _future):
+        with self._lock:
+            self.pending -= 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.busy():
+                raise PasswordHasherBusy(f"{self.pending} password hashing jobs pending")
+            self.pending += 1
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        # Released when the worker finishes, even if the request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+def init_password_hasher(warm_up=False):
+    """Creates the process-wide hashing pool (API startup, or first use)."""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+            if warm_up:
+                _hasher.warm_up()
+    return _hasher
+
+def get_password_hasher() -> PasswordHasher:
+    return _hasher or init_password_hasher()
+
+def shutdown_password_hasher():
+    global _hasher
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+            _hasher = None
+
+def password_hasher_busy() -> bool:
+    return get_password_hasher().busy()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the hashing pool. Raises PasswordHasherBusy when it's full."""
+    return await get_password_hasher().verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash in the hashing pool. Raises PasswordHasherBusy when it's full."""
+    return await get_password_hasher().hash(password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a JWT token containing user claims.
@@ -0,0 +1,123 @@
+from sqlalchemy import text
+
+# --- VERSIONED MIGRATIONS ---
+# Base.metadata.create_all() only creates missing tables. Anything that changes
+# an EXISTING table (new columns, constraints, indexes) is listed here, in order.
+# Each step runs once and is recorded in 'schema_migrations'. All pending steps
+# run in one transaction, so a failure leaves the schema untouched. Steps must
+# be idempotent (IF NOT EXISTS) because a fresh database already gets the final
+# schema from create_all().
+MIGRATIONS = [
+    (1, "search_results unique (search_id, lead_id)", [
+        # Drop duplicate links left by the old per-lead save path, keeping the first
+        """
+        DELETE FROM search_results a
+        USING search_results b
+        WHERE a.search_id = b.search_id AND a.lead_id = b.lead_id AND a.id > b.id
+        """,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_search_results_search_lead
+        ON search_results (search_id, lead_id)
+        """,
+    ]),
+    (2, "campaign_leads.created_at", [
+        "ALTER TABLE campaign_leads ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ",
+        # Existing roster rows were added when their campaign was created
+        """
+        UPDATE campaign_leads cl SET created_at = c.created_at
+        FROM campaigns c
+        WHERE cl.campaign_id = c.id AND cl.created_at IS NULL
+        """,
+        "ALTER TABLE campaign_leads ALTER COLUMN created_at SET DEFAULT now()",
+    ]),
+    (3, "composite indexes for inbox, launch and inbound queries", [
+        "CREATE INDEX IF NOT EXISTS ix_messages_campaign_created ON messages (campaign_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_messages_lead_direction_created ON messages (lead_id, direction, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_campaign_leads_campaign_status ON campaign_leads (campaign_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_campaign_leads_lead_created ON campaign_leads (lead_id, created_at)",
+    ]),
+    (4, "campaign_leads job queue claims", [
+        "ALTER TABLE campaign_leads ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ",
+        "CREATE INDEX IF NOT EXISTS ix_campaign_leads_status_id ON campaign_leads (status, id)",
+    ]),
+    (5, "campaign_stats backfill", [
+        # The table itself comes from create_all(); fill it for existing campaigns
+        """
+        INSERT INTO campaign_stats (campaign_id, total, queued, sent, failed, replied, delivered, total_cost)
+        SELECT c.id,
+               COALESCE(r.total, 0), COALESCE(r.queued, 0), COALESCE(r.sent, 0),
+               COALESCE(r.failed, 0), COALESCE(r.replied, 0),
+               COALESCE(m.delivered, 0), COALESCE(m.total_cost, 0)
+        FROM campaigns c
+        LEFT JOIN (
+            SELECT campaign_id,
+                   COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status IN ('queued', 'sending')) AS queued,
+                   COUNT(*) FILTER (WHERE status = 'sent') AS sent,
+                   COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+                   COUNT(*) FILTER (WHERE status = 'replied') AS replied
+            FROM campaign_leads GROUP BY campaign_id
+        ) r ON r.campaign_id = c.id
+        LEFT JOIN (
+            SELECT campaign_id,
+                   COUNT(*) FILTER (WHERE status IN ('delivered', 'read')) AS delivered,
+                   SUM(cost) AS total_cost
+            FROM messages WHERE direction LIKE 'outbound%' GROUP BY campaign_id
+        ) m ON m.campaign_id = c.id
+        ON CONFLICT (campaign_id) DO NOTHING
+        """,
+    ]),
+    (6, "search_results keyset index", [
+        "CREATE INDEX IF NOT EXISTS ix_search_results_search_id_id ON search_results (search_id, id)",
+    ]),
+    (7, "leads.updated_at for incremental snapshots", [
+        "ALTER TABLE leads ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ",
+        "UPDATE leads SET updated_at = now() WHERE updated_at IS NULL",
+        "ALTER TABLE leads ALTER COLUMN updated_at SET DEFAULT now()",
+        "CREATE INDEX IF NOT EXISTS ix_leads_updated_at_radar_id ON leads (updated_at, radar_id)",
+    ]),
+    (8, "campaign_leads.last_activity_at for inbox paging", [
+        "ALTER TABLE campaign_leads ADD COLUMN IF NOT EXISTS last_activity_at TIMESTAMPTZ",
+        "CREATE INDEX IF NOT EXISTS ix_messages_campaign_lead_created ON messages (campaign_id, lead_id, created_at)",
+        # Last message with the lead in the campaign, else when the campaign started
+        """
+        UPDATE campaign_leads cl
+        SET last_activity_at = COALESCE(
+            (SELECT MAX(m.created_at) FROM messages m
+             WHERE m.campaign_id = cl.campaign_id AND m.lead_id = cl.lead_id),
+            c.created_at, cl.created_at, now()
+        )
+        FROM campaigns c
+        WHERE cl.campaign_id = c.id AND cl.last_activity_at IS NULL
+        """,
+        "ALTER TABLE campaign_leads ALTER COLUMN last_activity_at SET DEFAULT now()",
+        "CREATE INDEX IF NOT EXISTS ix_campaign_leads_campaign_activity ON campaign_leads (campaign_id, last_activity_at, id)",
+    ]),
+]
+
+# Arbitrary constant: serializes migrations when several API workers boot at once
+MIGRATION_LOCK_ID = 814_220_931
+
+def run_migrations(engine):
+    """Applies every migration newer than the database's current version."""
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """))
+        applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+        for version, name, statements in MIGRATIONS:
+            if version in applied:
+                continue
+            print(f"⏳ Migration {version}: {name}...")
+            for statement in statements:
+                conn.execute(text(statement))
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                {"v": version, "n": name}
+            )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.database import Base
@@ -40,6 +40,9 @@ class SearchHistory(Base):
 # --- TABLE 3: LEADS (Real Estate Data) ---
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_updated_at_radar_id", "updated_at", "radar_id"), # Snapshot: leads changed since the watermark
+    )
 
     # Identity
     radar_id = Column(String, primary_key=True, index=True)
@@ -73,14 +76,40 @@ class Lead(Base):
     
     # Status
     is_purchased = Column(Boolean, default=False) 
+
+    # Change tracking: bumped only when an upsert actually changes the row
+    # (incremental Parquet snapshots export leads updated since the last run)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     searches = relationship("SearchResult", back_populates="lead")
     messages = relationship("Message", back_populates="lead") # <--- UPDATED: Points to new Message table
+    phones = relationship("LeadPhone", back_populates="lead")
+
+# --- TABLE 3b: LEAD PHONES (Inbound SMS Index) ---
+# One row per normalized (E.164) number of a lead, mirrored from
+# Lead.phone_numbers by the repository. Inbound SMS routing is an indexed
+# equality lookup on 'phone' instead of a LIKE scan over the JSON column.
+class LeadPhone(Base):
+    __tablename__ = "lead_phones"
+    __table_args__ = (
+        UniqueConstraint("lead_id", "phone", name="uq_lead_phones_lead_phone"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    lead_id = Column(String, ForeignKey("leads.radar_id"), nullable=False, index=True)
+    phone = Column(String(16), nullable=False, index=True) # "+18045550100"
+
+    lead = relationship("Lead", back_populates="phones")
 
 # --- TABLE 4: SEARCH RESULTS (Junction) ---
 class SearchResult(Base):
     __tablename__ = "search_results"
+    __table_args__ = (
+        # One link per lead per search (also the ON CONFLICT target for bulk ingest)
+        UniqueConstraint("search_id", "lead_id", name="uq_search_results_search_lead"),
+        Index("ix_search_results_search_id_id", "search_id", "id"), # History: a search's leads in keyset order
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     search_id = Column(Integer, ForeignKey("search_history.id"))
@@ -106,19 +135,54 @@ class Campaign(Base):
     user = relationship("User", back_populates="campaigns")
     campaign_leads = relationship("CampaignLead", back_populates="campaign")
     messages = relationship("Message", back_populates="campaign")
+    stats = relationship("CampaignStats", uselist=False, back_populates="campaign")
+
+# --- TABLE 5b: CAMPAIGN STATS (Dashboard Counters) ---
+# One row per campaign, kept current with 'x = x + n' updates by the send
+# worker, the inbound handler and status callbacks (see repository.bump_campaign_stats),
+# so listings and dashboards never count campaign_leads or messages.
+class CampaignStats(Base):
+    __tablename__ = "campaign_stats"
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), primary_key=True)
+
+    # Roster counters ('queued' includes rows a worker is sending right now)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    queued = Column(Integer, nullable=False, default=0, server_default="0")
+    sent = Column(Integer, nullable=False, default=0, server_default="0")
+    failed = Column(Integer, nullable=False, default=0, server_default="0")
+    replied = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Message counters (from Twilio status callbacks / send responses)
+    delivered = Column(Integer, nullable=False, default=0, server_default="0")
+    total_cost = Column(Float, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    campaign = relationship("Campaign", back_populates="stats")
 
 
 # --- NEW TABLE 6: CAMPAIGN LEADS (The Roster) ---
 # This joins Leads to Campaigns. A lead can be in multiple campaigns.
 class CampaignLead(Base):
     __tablename__ = "campaign_leads"
+    __table_args__ = (
+        Index("ix_campaign_leads_campaign_status", "campaign_id", "status"), # Launch: queued leads of a campaign
+        Index("ix_campaign_leads_lead_created", "lead_id", "created_at"),   # Inbound: latest roster entry of a lead
+        Index("ix_campaign_leads_status_id", "status", "id"),                # Worker: oldest queued rows across campaigns
+        Index("ix_campaign_leads_campaign_activity", "campaign_id", "last_activity_at", "id"),  # Inbox: contact list pages
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
     lead_id = Column(String, ForeignKey("leads.radar_id"))
     
     # Status in this specific campaign
-    status = Column(String, default="queued") # queued, sent, replied, stopped
+    status = Column(String, default="queued") # queued, sending, sent, failed, replied, stopped
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime(timezone=True), nullable=True) # When a worker took it ('sending')
+    # Time of the last message with this lead in this campaign (roster creation until then)
+    last_activity_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     campaign = relationship("Campaign", back_populates="campaign_leads")
@@ -128,6 +192,11 @@ class CampaignLead(Base):
 # --- TABLE 7: MESSAGES (The Chat Bubbles) ---
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_campaign_created", "campaign_id", "created_at"),                  # Inbox
+        Index("ix_messages_lead_direction_created", "lead_id", "direction", "created_at"),   # Inbound: last outbound touch
+        Index("ix_messages_campaign_lead_created", "campaign_id", "lead_id", "created_at"),  # Inbox: last message per lead
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
@@ -151,3 +220,41 @@ class Message(Base):
     # Relationships
     campaign = relationship("Campaign", back_populates="messages")
     lead = relationship("Lead", back_populates="messages")
+
+
+# --- TABLE 8: RADAR LIST REGISTRY (Scanner Cache) ---
+# Maps the canonical hash of a scan's PropertyRadar criteria to the ListID
+# that monitors it, so warm scans skip list discovery entirely.
+class RadarList(Base):
+    __tablename__ = "radar_lists"
+
+    criteria_hash = Column(String(64), primary_key=True)
+    list_id = Column(Integer, nullable=False, index=True)
+    list_name = Column(String)
+
+    verified_at = Column(DateTime(timezone=True), nullable=False) # Last time PropertyRadar confirmed it exists
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# --- TABLE 9: LIST WATERMARKS (Delta Scans) ---
+# Last successful harvest per PropertyRadar list. Scans after the first
+# only ask for items AddedSince this point.
+class ListWatermark(Base):
+    __tablename__ = "list_watermarks"
+
+    list_id = Column(Integer, primary_key=True)
+    last_harvested_at = Column(DateTime(timezone=True), nullable=False)
+    last_full_scan_at = Column(DateTime(timezone=True), nullable=False) # Delta scans can't see removals; full scans can
+
+
+# --- TABLE 10: LIST ITEMS (Cached Scan Results) ---
+# Everything harvested from a list so far. Delta scans merge into this.
+class ListItem(Base):
+    __tablename__ = "list_items"
+
+    list_id = Column(Integer, primary_key=True)
+    radar_id = Column(String, primary_key=True)
+
+    address = Column(String, nullable=True)
+    owner = Column(String, nullable=True)
+    seen_at = Column(DateTime(timezone=True), server_default=func.now())
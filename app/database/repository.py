@@ -1,6 +1,10 @@
+from sqlalchemy import update, case, cast, func, or_, JSON
 from sqlalchemy.orm import Session
-from app.database.models import Lead, SearchHistory, SearchResult
-from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert, JSONB
+from app.database.models import Lead, LeadPhone, SearchHistory, SearchResult, RadarList, ListWatermark, ListItem, CampaignStats, CampaignLead
+from app.utils.phone_numbers import normalized_phones
+from datetime import datetime, timezone
+from app.core.config import Config
 import json
 
 def create_search_record(db: Session, state: str, city: str, strategy: str, user_id: int = None):
@@ -20,14 +24,14 @@ def create_search_record(db: Session, state: str, city: str, strategy: str, user
     db.refresh(search) 
     return search
 
-def save_lead(db: Session, data: dict, search_id: int):
+def lead_row(data: dict):
     """
-    2. SAVING THE LEAD
-    Updated to mark 'is_purchased = True' so the Scanner knows we own it.
+    Parses one PropertyRadar record into 'leads' column values.
+    Returns None if the record has no RadarID.
     """
     radar_id = data.get('RadarID')
     if not radar_id:
-        return 
+        return None
 
     # A. Extract Owner Info
     persons = data.get('Persons', [])
@@ -55,35 +59,53 @@ def save_lead(db: Session, data: dict, search_id: int):
                     val = e.get('Value') or e.get('value')
                     if val: emails.append(val)
 
-    # B. Check/Create Lead
+    # B. Column Values
+    # We explicitly mark this lead as purchased/owned so the Scanner knows
+    return {
+        "radar_id": radar_id,
+        "is_purchased": True,
+
+        "address": data.get('Address'),
+        "city": data.get('City'),
+        "state": data.get('State'),
+        "zip_code": data.get('Zip') or data.get('ZipFive'),
+
+        "beds": data.get('Beds'),
+        "baths": data.get('Baths'),
+        "sq_ft": data.get('SqFt'),
+        "year_built": data.get('Year') or data.get('YearBuilt'),
+        "estimated_value": data.get('AVM'),
+        "estimated_equity": data.get('Equity') or data.get('AvailableEquity'),
+
+        "owner_name": owner_name,
+        "phone_numbers": phones,
+        "email_addresses": emails,
+        "raw_property_data": data,
+    }
+
+def save_lead(db: Session, data: dict, search_id: int):
+    """
+    2. SAVING THE LEAD
+    Updated to mark 'is_purchased = True' so the Scanner knows we own it.
+    """
+    row = lead_row(data)
+    if not row:
+        return 
+    radar_id = row["radar_id"]
+
+    # Check/Create Lead
     lead = db.query(Lead).filter(Lead.radar_id == radar_id).first()
 
     if not lead:
         lead = Lead(radar_id=radar_id)
         db.add(lead)
     
-    # --- THE FIX IS HERE ---
-    # We explicitly mark this lead as purchased/owned
-    lead.is_purchased = True 
-    
-    # C. Update Fields
-    lead.address = data.get('Address')
-    lead.city = data.get('City')
-    lead.state = data.get('State')
-    lead.zip_code = data.get('Zip') or data.get('ZipFive')
-    
-    lead.beds = data.get('Beds')
-    lead.baths = data.get('Baths')
-    lead.sq_ft = data.get('SqFt')
-    lead.year_built = data.get('Year') or data.get('YearBuilt')
-    lead.estimated_value = data.get('AVM')
-    lead.estimated_equity = data.get('Equity') or data.get('AvailableEquity')
-    
-    lead.owner_name = owner_name
-    lead.phone_numbers = phones  
-    lead.email_addresses = emails
-    lead.raw_property_data = data 
+    # Update Fields
+    for column, value in row.items():
+        setattr(lead, column, value)
     
+    db.flush()
+    sync_lead_phones(db, {radar_id: row["phone_numbers"]})
     db.commit()
 
     # D. Link to Search
@@ -98,3 +120,244 @@ def save_lead(db: Session, data: dict, search_id: int):
         db.commit()
 
     return lead
+
+def lead_changed(stmt, columns):
+    """ON CONFLICT condition: does the incoming row differ from the stored one in any of `columns`?"""
+    checks = []
+    for column in columns:
+        stored, incoming = Lead.__table__.c[column], stmt.excluded[column]
+        if isinstance(stored.type, JSON):
+            # json has no equality operator; compare as jsonb
+            stored, incoming = cast(stored, JSONB), cast(incoming, JSONB)
+        checks.append(stored.is_distinct_from(incoming))
+    return or_(*checks)
+
+def save_leads_bulk(db: Session, records: list, search_id: int, chunk_size: int = None) -> int:
+    """
+    2b. SAVING MANY LEADS
+    Batch version of save_lead: parses every record in one pass, then per chunk
+    runs one INSERT ... ON CONFLICT DO UPDATE into 'leads' and one
+    INSERT ... ON CONFLICT DO NOTHING into 'search_results', in one transaction.
+
+    Safe under concurrent enrichment workers: conflicts are resolved by
+    Postgres, and rows are written in radar_id order so two workers
+    touching the same leads lock them in the same order (no deadlocks).
+    Returns the number of leads written.
+    """
+    chunk_size = chunk_size or Config.INGEST_CHUNK_SIZE
+
+    # Last record wins if a RadarID repeats (ON CONFLICT can't touch a row twice)
+    rows = {}
+    for data in records:
+        row = lead_row(data)
+        if row: rows[row["radar_id"]] = row
+    rows = [rows[rid] for rid in sorted(rows)]
+
+    written = 0
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        try:
+            stmt = insert(Lead).values(chunk)
+            columns = [column for column in chunk[0] if column != "radar_id"]
+            set_ = {column: stmt.excluded[column] for column in columns}
+            # Re-ingesting an identical record keeps its updated_at (no snapshot churn)
+            set_["updated_at"] = case((lead_changed(stmt, columns), func.now()), else_=Lead.updated_at)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[Lead.radar_id],
+                set_=set_
+            ))
+
+            sync_lead_phones(db, {r["radar_id"]: r["phone_numbers"] for r in chunk})
+
+            links = insert(SearchResult).values([{"search_id": search_id, "lead_id": r["radar_id"]} for r in chunk])
+            db.execute(links.on_conflict_do_nothing(index_elements=[SearchResult.search_id, SearchResult.lead_id]))
+
+            db.commit()
+            written += len(chunk)
+        except Exception:
+            db.rollback()
+            raise
+
+    return written
+
+def sync_lead_phones(db: Session, phones_by_lead: dict):
+    """
+    2c. PHONE INDEX
+    Replaces the 'lead_phones' rows of the given leads with their normalized
+    numbers. Does NOT commit - runs inside the caller's lead write.
+    """
+    if not phones_by_lead:
+        return
+
+    db.query(LeadPhone).filter(LeadPhone.lead_id.in_(list(phones_by_lead)))\
+        .delete(synchronize_session=False)
+
+    rows = [
+        {"lead_id": lead_id, "phone": phone}
+        for lead_id in sorted(phones_by_lead)
+        for phone in normalized_phones(phones_by_lead[lead_id])
+    ]
+    if rows:
+        db.execute(insert(LeadPhone).values(rows).on_conflict_do_nothing(
+            index_elements=[LeadPhone.lead_id, LeadPhone.phone]
+        ))
+
+def backfill_lead_phones(db: Session, batch_size: int = 1000) -> int:
+    """
+    2d. PHONE INDEX BACKFILL
+    Rebuilds 'lead_phones' for every existing lead, walking 'leads' by
+    radar_id in batches (one transaction per batch). Safe to re-run.
+    Returns the number of leads processed.
+    """
+    processed = 0
+    last_id = ""
+    while True:
+        batch = db.query(Lead.radar_id, Lead.phone_numbers)\
+            .filter(Lead.radar_id > last_id)\
+            .order_by(Lead.radar_id)\
+            .limit(batch_size)\
+            .all()
+        if not batch:
+            return processed
+
+        sync_lead_phones(db, {row.radar_id: row.phone_numbers for row in batch})
+        db.commit()
+
+        processed += len(batch)
+        last_id = batch[-1].radar_id
+        print(f"   📞 Backfilled phones for {processed} leads...")
+
+def get_registered_list(db: Session, criteria_hash: str):
+    """
+    3. LIST REGISTRY LOOKUP
+    Returns the cached RadarList for a criteria hash (or None).
+    """
+    return db.query(RadarList).filter(RadarList.criteria_hash == criteria_hash).first()
+
+def register_list(db: Session, criteria_hash: str, list_id: int, list_name: str):
+    """
+    4. LIST REGISTRY WRITE
+    Creates or refreshes the registry entry and marks it verified now.
+    """
+    entry = db.merge(RadarList(
+        criteria_hash=criteria_hash,
+        list_id=list_id,
+        list_name=list_name,
+        verified_at=datetime.now(timezone.utc)
+    ))
+    db.commit()
+    return entry
+
+def get_list_watermark(db: Session, list_id: int):
+    """
+    5. DELTA SCAN WATERMARK
+    Returns the ListWatermark for a list (or None if never harvested).
+    """
+    return db.query(ListWatermark).filter(ListWatermark.list_id == list_id).first()
+
+def cache_list_items(db: Session, list_id: int, items, replace: bool = False, chunk_size: int = 1000) -> int:
+    """
+    6. SCAN RESULT CACHE WRITE
+    Merges harvested list items into 'list_items' (upsert per chunk).
+    With replace=True the previous contents are dropped first (full scan).
+    Does NOT commit - save_list_watermark commits cache and watermark together.
+    """
+    if replace:
+        db.query(ListItem).filter(ListItem.list_id == list_id).delete(synchronize_session=False)
+
+    def flush(rows):
+        stmt = insert(ListItem).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ListItem.list_id, ListItem.radar_id],
+            set_={"address": stmt.excluded.address, "owner": stmt.excluded.owner}
+        ))
+
+    fetched = 0
+    rows = {}
+    for item in items:
+        rid = item.get('RadarID')
+        if not rid: continue
+        fetched += 1
+        rows[rid] = {"list_id": list_id, "radar_id": rid, "address": item.get('Address'), "owner": item.get('Owner')}
+        if len(rows) >= chunk_size:
+            flush(list(rows.values()))
+            rows = {}
+
+    if rows:
+        flush(list(rows.values()))
+    return fetched
+
+def iter_cached_list_items(db: Session, list_id: int, batch_size: int = 1000):
+    """
+    7. SCAN RESULT CACHE READ
+    Streams a list's cached items in the same shape PropertyRadar returns them.
+    """
+    query = db.query(ListItem.radar_id, ListItem.address, ListItem.owner)\
+        .filter(ListItem.list_id == list_id)\
+        .order_by(ListItem.seen_at, ListItem.radar_id)\
+        .yield_per(batch_size)
+
+    for row in query:
+        item = {"RadarID": row.radar_id}
+        if row.address: item["Address"] = row.address
+        if row.owner: item["Owner"] = row.owner
+        yield item
+
+def save_list_watermark(db: Session, list_id: int, harvested_at: datetime, full_scan: bool):
+    """
+    8. WATERMARK WRITE
+    Records a successful harvest and commits it with the cached items.
+    """
+    watermark = get_list_watermark(db, list_id) or ListWatermark(list_id=list_id)
+    watermark.last_harvested_at = harvested_at
+    if full_scan or watermark.last_full_scan_at is None:
+        watermark.last_full_scan_at = harvested_at
+    db.add(watermark)
+    db.commit()
+    return watermark
+
+# --- CAMPAIGN STATS ---
+ROSTER_COUNTERS = {"queued": "queued", "sending": "queued", "sent": "sent", "failed": "failed", "replied": "replied"}
+
+def roster_status_deltas(old_status: str, new_status: str, deltas: dict = None) -> dict:
+    """
+    Adds the counter changes for one roster row moving old -> new to `deltas`
+    (e.g. sent -> replied is {"sent": -1, "replied": +1}).
+    """
+    deltas = {} if deltas is None else deltas
+    old, new = ROSTER_COUNTERS.get(old_status), ROSTER_COUNTERS.get(new_status)
+    if old != new:
+        if old:
+            deltas[old] = deltas.get(old, 0) - 1
+        if new:
+            deltas[new] = deltas.get(new, 0) + 1
+    return deltas
+
+def bump_campaign_stats(db: Session, campaign_id: int, deltas: dict):
+    """
+    Applies counter deltas with one atomic 'x = x + n' UPDATE, so concurrent
+    workers and webhooks never lose increments. Does not commit.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not campaign_id or not deltas:
+        return
+    db.execute(
+        update(CampaignStats)
+        .where(CampaignStats.campaign_id == campaign_id)
+        .values({getattr(CampaignStats, k): getattr(CampaignStats, k) + v for k, v in deltas.items()})
+        .execution_options(synchronize_session=False)
+    )
+
+def touch_roster_activity(db: Session, campaign_id: int, lead_id: str):
+    """
+    Moves a lead to the top of its campaign's inbox: call wherever a message
+    for (campaign, lead) is written, in the same transaction. Does not commit.
+    """
+    if not campaign_id:
+        return
+    db.execute(
+        update(CampaignLead)
+        .where(CampaignLead.campaign_id == campaign_id, CampaignLead.lead_id == lead_id)
+        .values(last_activity_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
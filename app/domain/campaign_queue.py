@@ -0,0 +1,146 @@
+import time
+from datetime import timedelta
+from sqlalchemy import select, update, exists, func
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import Config
+from app.database.database import get_db
+from app.database.models import Campaign, CampaignLead, Message
+from app.database.repository import roster_status_deltas, bump_campaign_stats
+from app.services.campaign_service import send_campaign_batch, twilio_client
+
+# --- DURABLE CAMPAIGN QUEUE ---
+# The queue IS the 'campaign_leads' table. A worker claims the oldest 'queued'
+# rows with SELECT ... FOR UPDATE SKIP LOCKED and flips them to 'sending' in
+# the same committed transaction, so any number of worker processes (on any
+# number of machines) never pick up the same row. Sending then happens outside
+# that transaction and each outcome moves the row to 'sent' / 'failed'.
+
+INTERRUPTED_ERROR = "Send interrupted (worker stopped). Not retried to avoid a duplicate text."
+
+def claim_batch(db: Session, batch_size: int = None) -> list:
+    """
+    Atomically claims up to `batch_size` queued roster rows across all
+    still-running ('processing') campaigns, oldest first, and returns them
+    with lead + campaign loaded. Rows of archived campaigns stay queued.
+    """
+    batch_size = batch_size or Config.CAMPAIGN_CLAIM_BATCH_SIZE
+
+    pending = select(CampaignLead.id).join(
+        Campaign, Campaign.id == CampaignLead.campaign_id
+    ).where(
+        CampaignLead.status == "queued",
+        Campaign.status == "processing"
+    ).order_by(CampaignLead.id).limit(batch_size).with_for_update(of=CampaignLead, skip_locked=True)
+
+    # claimed_at uses the database clock, and so does the lease check in
+    # recover_stale_claims
+    claimed_ids = db.execute(
+        update(CampaignLead)
+        .where(CampaignLead.id.in_(pending.scalar_subquery()))
+        .values(status="sending", claimed_at=func.now())
+        .returning(CampaignLead.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+
+    if not claimed_ids:
+        return []
+
+    return db.query(CampaignLead).options(
+        joinedload(CampaignLead.lead),
+        joinedload(CampaignLead.campaign),
+    ).filter(CampaignLead.id.in_(claimed_ids)).order_by(CampaignLead.id).all()
+
+def recover_stale_claims(db: Session, lease_minutes: int = None) -> int:
+    """
+    Settles rows left in 'sending' by a worker that died mid-batch.
+
+    Delivery is at-most-once. Outcomes are committed together with the
+    roster status, so a row still 'sending' has no logged outcome and we
+    can't know whether Twilio accepted the text before the crash. The row
+    is failed with a logged reason instead of being re-sent.
+    """
+    lease = timedelta(minutes=lease_minutes or Config.CAMPAIGN_CLAIM_LEASE_MINUTES)
+
+    stale = db.query(CampaignLead).filter(
+        CampaignLead.status == "sending",
+        CampaignLead.claimed_at < func.now() - lease
+    ).with_for_update(skip_locked=True).all()
+
+    stats = {}  # campaign id -> counter deltas
+    for item in stale:
+        # The reason doubles as the body so the thread and inbox preview say what happened
+        db.add(Message(
+            campaign_id=item.campaign_id,
+            lead_id=item.lead_id,
+            direction="outbound-api",
+            body=INTERRUPTED_ERROR,
+            status="failed",
+            error_message=INTERRUPTED_ERROR
+        ))
+        item.status = "failed"
+        item.claimed_at = None
+        item.last_activity_at = func.now()
+        roster_status_deltas("sending", "failed", stats.setdefault(item.campaign_id, {}))
+
+    for campaign_id, deltas in stats.items():
+        bump_campaign_stats(db, campaign_id, deltas)
+    db.commit()
+    if stale:
+        print(f"   ♻️ Recovered {len(stale)} abandoned campaign claims.")
+    return len(stale)
+
+def complete_drained_campaigns(db: Session, campaign_ids) -> None:
+    """Marks campaigns 'completed' once none of their roster rows are queued or sending."""
+    if not campaign_ids:
+        return
+
+    still_pending = exists().where(
+        CampaignLead.campaign_id == Campaign.id,
+        CampaignLead.status.in_(["queued", "sending"])
+    )
+    db.query(Campaign).filter(
+        Campaign.id.in_(campaign_ids),
+        Campaign.status == "processing",
+        ~still_pending
+    ).update({"status": "completed"}, synchronize_session=False)
+    db.commit()
+
+def run_worker(stop_event=None, batch_size: int = None, poll_seconds: float = None, once: bool = False):
+    """
+    Claims and sends batches until `stop_event` is set (or, with `once`,
+    until the queue is empty). A stop request finishes the current batch first.
+    """
+    poll = poll_seconds or Config.CAMPAIGN_POLL_SECONDS
+    client = twilio_client()
+    db = next(get_db())
+    last_recovery = 0.0
+
+    print(f"📨 Campaign worker started (batch: {batch_size or Config.CAMPAIGN_CLAIM_BATCH_SIZE})")
+    try:
+        while not (stop_event and stop_event.is_set()):
+            try:
+                if time.monotonic() - last_recovery > 60:
+                    recover_stale_claims(db)
+                    last_recovery = time.monotonic()
+
+                items = claim_batch(db, batch_size)
+                if items:
+                    campaign_ids = {item.campaign_id for item in items}
+                    send_campaign_batch(db, items, client)
+                    complete_drained_campaigns(db, campaign_ids)
+                    continue
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Campaign worker error: {e}")
+
+            if once:
+                break
+            if stop_event:
+                stop_event.wait(poll)
+            else:
+                time.sleep(poll)
+    finally:
+        db.close()
+        print("📨 Campaign worker stopped.")
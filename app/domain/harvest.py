@@ -1,29 +1,44 @@
 import time
-import json
-import ast
+import asyncio
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from sqlalchemy import desc
 
 # Services (The Tools)
 from app.services.property_radar import PropertyRadarClient
+from app.services.property_radar_async import AsyncPropertyRadarClient
 from app.core.criteria_mapper import CriteriaMapper
+from app.core.config import Config
+from app.utils.db_lists import parse_db_list
 
 # Database (The Memory)
 from app.database.database import get_db
 from app.database.models import SearchHistory, Lead
-from app.database.repository import create_search_record, save_lead
-
-# --- HELPER: ROBUST LIST PARSER (Unchanged) ---
-def parse_db_list(value):
-    if not value: return []
-    if isinstance(value, list): return value
-    if isinstance(value, str):
-        value = value.strip()
-        try: return json.loads(value)
-        except: pass
-        try: return ast.literal_eval(value)
-        except: pass
-        return [value]
-    return []
+from app.database.repository import (
+    create_search_record, save_lead, save_leads_bulk,
+    get_list_watermark, cache_list_items, iter_cached_list_items, save_list_watermark
+)
+from app.domain.list_registry import resolve_list_id
+from app.domain.scan_cache import scan_cache
+
+# One client for the scan and enrich paths: both ride the same pooled session
+radar_client = PropertyRadarClient()
+
+# Async twin for the API's enrich endpoint: one connection pool per process,
+# created on first use and closed by the API lifespan
+async_radar_client = None
+
+def get_async_radar_client():
+    global async_radar_client
+    if async_radar_client is None:
+        async_radar_client = AsyncPropertyRadarClient()
+    return async_radar_client
+
+async def close_async_radar_client():
+    global async_radar_client
+    if async_radar_client is not None:
+        await async_radar_client.aclose()
+        async_radar_client = None
 
 # --- HELPER: UNLOCK CHECKER (Unchanged) ---
 def needs_unlocking(data_list):
@@ -44,79 +59,145 @@ def needs_unlocking(data_list):
     if has_locked: return True
     return False
 
+# --- HELPER: OWNED LEAD SUMMARY ---
+OWNED_LEAD_COLUMNS = (
+    Lead.radar_id, Lead.address, Lead.city, Lead.state, Lead.owner_name,
+    Lead.estimated_equity, Lead.estimated_value, Lead.beds, Lead.baths,
+    Lead.sq_ft, Lead.year_built, Lead.phone_numbers, Lead.email_addresses
+)
+
+def owned_lead_summary(db_lead):
+    return {
+        "radar_id": db_lead.radar_id,
+        "address": db_lead.address if db_lead.address else "N/A",
+        "city": db_lead.city,
+        "state": db_lead.state,
+        "owner_name": db_lead.owner_name,
+        "is_purchased": True,
+        "equity_value": db_lead.estimated_equity,
+        "estimated_value": db_lead.estimated_value,
+        "beds": db_lead.beds,
+        "baths": db_lead.baths,
+        "sq_ft": db_lead.sq_ft,
+        "year_built": db_lead.year_built,
+        "phone_numbers": parse_db_list(db_lead.phone_numbers),
+        "emails": parse_db_list(db_lead.email_addresses)
+    }
+
+# --- HELPER: NEW vs OWNED DIFF ---
+def classify_list_items(db, items, chunk_size=None):
+    """
+    Splits scanned list items into new leads and leads we already own.
+    Only the scanned IDs are looked up, one IN query per chunk, so cost
+    follows the size of the list - not the size of the leads table.
+    Returns (total_found, new_leads, owned_leads).
+    """
+    chunk_size = chunk_size or Config.SCAN_DIFF_CHUNK_SIZE
+    total_found = 0
+    new_leads_list = []
+    owned_leads_full = []
+    owned_seen = set()
+    chunk = []
+
+    def flush(chunk):
+        ids = {item['RadarID'] for item in chunk}
+        owned = {
+            row.radar_id: row
+            for row in db.query(*OWNED_LEAD_COLUMNS).filter(Lead.radar_id.in_(ids))
+        }
+        for item in chunk:
+            rid = item['RadarID']
+            if rid in owned:
+                if rid not in owned_seen:
+                    owned_seen.add(rid)
+                    owned_leads_full.append(owned_lead_summary(owned[rid]))
+            else:
+                new_leads_list.append({
+                    "id": rid,
+                    "address": item.get('Address', 'Address Pending...'),
+                    "owner": item.get('Owner', 'Unknown'),
+                    "equity": 0.0
+                })
+
+    # Classify chunk by chunk as the paginator yields, instead of materializing the list first
+    for item in items:
+        total_found += 1
+        if not item.get('RadarID'): continue
+
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+
+    if chunk:
+        flush(chunk)
+
+    return total_found, new_leads_list, owned_leads_full
+
+# --- HELPER: DELTA OR FULL SCAN ---
+def is_delta_eligible(watermark, now):
+    """A delta scan is allowed until the last full scan is older than SCAN_FULL_REFRESH_HOURS."""
+    last_full = watermark.last_full_scan_at
+    if last_full.tzinfo is None:
+        last_full = last_full.replace(tzinfo=timezone.utc)
+    return now - last_full < timedelta(hours=Config.SCAN_FULL_REFRESH_HOURS)
+
 # --- MODULE 1: THE SCANNER ---
 # PATCH 1: Added user=None to prevent crash from search.py
-def scan_target_area(state, city, strategy, user=None):
+def scan_target_area(state, city, strategy, user=None, full_refresh=False):
     """
     PHASE 1: READ-ONLY
+    Served from the scan cache when possible; identical scans running at
+    the same time share one upstream fetch (see scan_cache.py).
+    """
+    key = scan_cache.make_key(state, city, strategy)
+
+    if full_refresh:
+        summary = run_scan(state, city, strategy, full_refresh=True)
+        if "error" not in summary: scan_cache.put(key, summary)
+        return summary
+
+    return scan_cache.get_or_compute(key, lambda: run_scan(state, city, strategy))
+
+def run_scan(state, city, strategy, full_refresh=False):
+    """
+    The upstream scan: list lookup, (delta) harvest and new/owned diff.
+    Re-scans of a known list only download what was added since the last
+    harvest; pass full_refresh=True to re-download the whole list.
     """
     list_name = f"Auto_Monitor_{city}_{strategy}"
     print(f"📡 Scanning: {list_name}...")
 
     db = next(get_db())
-    client = PropertyRadarClient()
+    client = radar_client
 
     try:
-        # ... (Your existing Scan logic remains 100% untouched) ...
-        existing_lists = client.get_my_lists()
-        target_list_id = next((l['ListID'] for l in existing_lists if l.get('ListName') == list_name), None)
-        
-        if not target_list_id:
-            print("   ⚠️ List not found. Creating it...")
-            criteria = CriteriaMapper.build_criteria(state, city, strategy)
-            target_list_id = client.create_dynamic_list(list_name, criteria)
-            if target_list_id: client.set_list_automation(target_list_id)
-            time.sleep(2)
+        # Registry first: a warm scan makes no list-discovery calls
+        target_list_id = resolve_list_id(db, client, state, city, strategy)
         
         if not target_list_id:
             return {"error": "Could not create/find list."}
 
-        print("   📥 Fetching IDs from PropertyRadar...")
-        items = client.get_new_list_items(target_list_id, added_since="2020-01-01")
-        
-        existing_ids = {id[0] for id in db.query(Lead.radar_id).all()}
-        
-        new_leads_list = []
-        owned_ids_found = []
-
-        for item in items:
-            rid = item.get('RadarID')
-            if not rid: continue
+        # Delta scan: only items added since the watermark, merged into the cached list
+        harvest_started = datetime.now(timezone.utc)
+        watermark = get_list_watermark(db, target_list_id)
+        delta = bool(watermark) and not full_refresh and is_delta_eligible(watermark, harvest_started)
+        added_since = (watermark.last_harvested_at - timedelta(days=1)).strftime("%Y-%m-%d") if delta else "2020-01-01"
 
-            if rid in existing_ids:
-                owned_ids_found.append(rid)
-            else:
-                new_leads_list.append({
-                    "id": rid,
-                    "address": item.get('Address', 'Address Pending...'),
-                    "owner": item.get('Owner', 'Unknown'),
-                    "equity": 0.0
-                })
+        print(f"   📥 Fetching IDs from PropertyRadar ({'delta since ' + added_since if delta else 'full'})...")
+        fetched = cache_list_items(
+            db, target_list_id,
+            client.iter_list_items(target_list_id, added_since=added_since),
+            replace=not delta
+        )
+        save_list_watermark(db, target_list_id, harvest_started, full_scan=not delta)
+        print(f"   📦 {fetched} items downloaded.")
 
-        owned_leads_full = []
-        if owned_ids_found:
-            db_leads = db.query(Lead).filter(Lead.radar_id.in_(owned_ids_found)).all()
-            
-            for db_lead in db_leads:
-                owned_leads_full.append({
-                    "radar_id": db_lead.radar_id,
-                    "address": db_lead.address if db_lead.address else "N/A",
-                    "city": db_lead.city,
-                    "state": db_lead.state,
-                    "owner_name": db_lead.owner_name,
-                    "is_purchased": True,
-                    "equity_value": db_lead.estimated_equity,
-                    "estimated_value": db_lead.estimated_value,
-                    "beds": db_lead.beds,
-                    "baths": db_lead.baths,
-                    "sq_ft": db_lead.sq_ft,
-                    "year_built": db_lead.year_built,
-                    "phone_numbers": parse_db_list(db_lead.phone_numbers),
-                    "emails": parse_db_list(db_lead.email_addresses)
-                })
+        items = iter_cached_list_items(db, target_list_id)
+        total_found, new_leads_list, owned_leads_full = classify_list_items(db, items)
 
         summary = {
-            "total_found": len(items),
+            "total_found": total_found,
             "new_count": len(new_leads_list),
             "purchased_count": len(owned_leads_full),
             "leads": new_leads_list,
@@ -129,57 +210,127 @@ def scan_target_area(state, city, strategy, user=None):
     finally:
         db.close()
 
+# --- HELPER: WHO TO UNLOCK ---
+def locked_fields(persons):
+    """
+    Sorts owners primary-first (in place) and returns the PersonKey of the
+    primary owner plus which of its contact fields still need buying.
+    """
+    if not persons: return None, []
+    persons.sort(key=lambda x: x.get('isPrimaryContact', 0), reverse=True)
+
+    person = persons[0]
+    pkey = person.get('PersonKey')
+    if not pkey: return None, []
+    return pkey, [field for field in ("Phone", "Email") if needs_unlocking(person.get(field))]
+
+# --- HELPER: SINGLE LEAD FETCH (runs on a worker thread) ---
+# Pacing between calls is handled by the shared rate limiter in the client.
+def fetch_enriched_lead(client, radar_id):
+    """
+    Pulls everything we buy for one lead: property record, owners and,
+    if still locked, the primary owner's phone/email.
+    Network only - no DB access, so it is safe to run concurrently.
+    """
+    prop_data = client.get_property_data(radar_id) or {"RadarID": radar_id}
+
+    persons = client.get_property_owners(radar_id)
+
+    pkey, fields = locked_fields(persons)
+    for field in fields:
+        print(f"      🔓 Unlocking {field} for {radar_id}...")
+        values = client.unlock_contact_field(pkey, field=field)
+        if values: persons[0][field] = values
+
+    prop_data['Persons'] = persons
+    return prop_data
+
+async def fetch_enriched_lead_async(client, radar_id):
+    """Same as fetch_enriched_lead, on the AsyncPropertyRadarClient."""
+    prop_data = await client.get_property_data(radar_id) or {"RadarID": radar_id}
+
+    persons = await client.get_property_owners(radar_id)
+
+    pkey, fields = locked_fields(persons)
+    for field in fields:
+        print(f"      🔓 Unlocking {field} for {radar_id}...")
+        values = await client.unlock_contact_field(pkey, field=field)
+        if values: persons[0][field] = values
+
+    prop_data['Persons'] = persons
+    return prop_data
+
+# --- HELPER: BATCH SAVE ---
+def ingest_batch(db, batch, search_id):
+    """
+    Writes a batch of (radar_id, record) pairs with one bulk upsert.
+    If the batch fails, falls back to save_lead per lead so one bad
+    record can't sink the others. Returns the radar IDs saved.
+    """
+    try:
+        save_leads_bulk(db, [data for _, data in batch], search_id)
+        return [rid for rid, _ in batch]
+    except Exception as e:
+        print(f"   ⚠️ Bulk save failed ({e}). Retrying lead by lead...")
+
+    saved = []
+    for rid, data in batch:
+        try:
+            save_lead(db, data, search_id)
+            saved.append(rid)
+        except Exception as e:
+            db.rollback()
+            print(f"   ❌ Error on {rid}: {e}")
+    return saved
+
+def set_search_total(db, search_id, total):
+    db.query(SearchHistory).filter(SearchHistory.id == search_id).update({SearchHistory.total_results: total})
+    db.commit()
+
 # --- MODULE 2: THE ENRICHER ---
 # PATCH 2: Added user=None to receive the user object
-def enrich_target_leads(radar_ids: list, state: str, city: str, strategy: str, user=None):
+def enrich_target_leads(radar_ids: list, state: str, city: str, strategy: str, user=None, max_workers=None):
     """
     PHASE 2: WRITE / SPEND
+    Leads are fetched concurrently (at most `max_workers` in flight);
+    saving stays on this thread, in INGEST_CHUNK_SIZE bulk upserts.
     """
-    print(f"🚀 Enriching {len(radar_ids)} leads...")
+    max_workers = max_workers or Config.ENRICH_MAX_WORKERS
+    print(f"🚀 Enriching {len(radar_ids)} leads ({max_workers} in flight)...")
     
     db = next(get_db())
-    client = PropertyRadarClient()
+    client = radar_client
     
     try:
         # PATCH 3: Pass user_id to the repository function so the history is owned
         user_id = user.id if user else None
         current_search = create_search_record(db, state, city, strategy, user_id=user_id)
         
-        leads_saved = 0
+        saved_ids = []
+        batch = []
         
-        # ... (Your existing Enrich logic remains 100% untouched) ...
-        for i, radar_id in enumerate(radar_ids):
-            try:
-                print(f"   [{i+1}/{len(radar_ids)}] Fetching {radar_id}...")
-                prop_data = client.get_property_data(radar_id) or {"RadarID": radar_id}
-                
-                persons = client.get_property_owners(radar_id)
-                
-                if persons:
-                    persons.sort(key=lambda x: x.get('isPrimaryContact', 0), reverse=True)
-                    for person in persons[:1]: 
-                        pkey = person.get('PersonKey')
-                        if pkey:
-                            if needs_unlocking(person.get('Phone')):
-                                print(f"      🔓 Unlocking Phone...")
-                                phones = client.unlock_contact_field(pkey, field="Phone")
-                                if phones: person['Phone'] = phones
-                                time.sleep(0.5)
-                            
-                            if needs_unlocking(person.get('Email')):
-                                print(f"      🔓 Unlocking Email...")
-                                emails = client.unlock_contact_field(pkey, field="Email")
-                                if emails: person['Email'] = emails
-                                time.sleep(0.5)
-
-                prop_data['Persons'] = persons
-                
-                save_lead(db, prop_data, current_search.id)
-                leads_saved += 1
-                
-            except Exception as e:
-                print(f"   ❌ Error on {radar_id}: {e}")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch_enriched_lead, client, rid): rid for rid in radar_ids}
+
+            for i, future in enumerate(as_completed(futures)):
+                radar_id = futures[future]
+                try:
+                    batch.append((radar_id, future.result()))
+                    print(f"   [{i+1}/{len(radar_ids)}] Fetched {radar_id}")
+                except Exception as e:
+                    print(f"   ❌ Error on {radar_id}: {e}")
+
+                if len(batch) >= Config.INGEST_CHUNK_SIZE:
+                    saved_ids += ingest_batch(db, batch, current_search.id)
+                    batch = []
+
+        if batch:
+            saved_ids += ingest_batch(db, batch, current_search.id)
+
+        # Cached scans listing these leads as "new" are now wrong
+        scan_cache.invalidate_radar_ids(saved_ids)
 
+        leads_saved = len(saved_ids)
         current_search.total_results = leads_saved
         db.commit()
         
@@ -188,3 +339,62 @@ def enrich_target_leads(radar_ids: list, state: str, city: str, strategy: str, u
     
     finally:
         db.close()
+
+
+async def enrich_target_leads_async(radar_ids: list, state: str, city: str, strategy: str, user=None, max_workers=None):
+    """
+    PHASE 2 (async): same contract as enrich_target_leads.
+    Leads are fetched on the event loop (at most `max_workers` in flight);
+    DB writes (bulk upserts) are handed to a worker thread one at a time.
+    """
+    max_workers = max_workers or Config.ENRICH_MAX_WORKERS
+    print(f"🚀 Enriching {len(radar_ids)} leads ({max_workers} in flight, async)...")
+
+    db = next(get_db())
+    in_flight = asyncio.Semaphore(max_workers)
+
+    async def fetch(client, radar_id):
+        async with in_flight:
+            try:
+                return radar_id, await fetch_enriched_lead_async(client, radar_id), None
+            except Exception as e:
+                return radar_id, None, e
+
+    try:
+        user_id = user.id if user else None
+        current_search = await asyncio.to_thread(create_search_record, db, state, city, strategy, user_id=user_id)
+        # Read once: every commit in ingest_batch expires the object, and a
+        # refresh here would hit the DB from the event loop
+        search_id = current_search.id
+
+        saved_ids = []
+        client = get_async_radar_client()
+        tasks = [fetch(client, rid) for rid in radar_ids]
+        batch = []
+
+        for i, next_done in enumerate(asyncio.as_completed(tasks)):
+            radar_id, prop_data, error = await next_done
+            if error:
+                print(f"   ❌ Error on {radar_id}: {error}")
+            else:
+                batch.append((radar_id, prop_data))
+                print(f"   [{i+1}/{len(radar_ids)}] Fetched {radar_id}")
+
+            if len(batch) >= Config.INGEST_CHUNK_SIZE:
+                saved_ids += await asyncio.to_thread(ingest_batch, db, batch, search_id)
+                batch = []
+
+        if batch:
+            saved_ids += await asyncio.to_thread(ingest_batch, db, batch, search_id)
+
+        # Cached scans listing these leads as "new" are now wrong
+        scan_cache.invalidate_radar_ids(saved_ids)
+
+        leads_saved = len(saved_ids)
+        await asyncio.to_thread(set_search_total, db, search_id, leads_saved)
+
+        print(f"✅ Batch Complete. {leads_saved} saved.")
+        return {"status": "success", "saved_count": leads_saved}
+
+    finally:
+        await asyncio.to_thread(db.close)
@@ -0,0 +1,107 @@
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import Config
+from app.core.criteria_mapper import CriteriaMapper
+from app.database.database import get_db
+from app.database.models import RadarList
+from app.database.repository import get_registered_list, register_list
+from app.services.property_radar import PropertyRadarClient
+
+# --- HELPER: CANONICAL CRITERIA HASH ---
+def criteria_hash(criteria) -> str:
+    """Stable SHA-256 of a criteria payload (key order and whitespace don't matter)."""
+    canonical = json.dumps(criteria, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def is_fresh(entry, ttl_minutes=None) -> bool:
+    ttl = timedelta(minutes=ttl_minutes or Config.LIST_REGISTRY_TTL_MINUTES)
+    verified_at = entry.verified_at
+    if verified_at.tzinfo is None:
+        verified_at = verified_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - verified_at < ttl
+
+# --- RESOLVER (used by the Scanner) ---
+def resolve_list_id(db, client, state, city, strategy):
+    """
+    Returns the ListID monitoring these criteria.
+    Warm path: a fresh registry hit costs zero PropertyRadar calls.
+    Cold/stale path: find the list by name (or create it) and register it.
+    """
+    list_name = f"Auto_Monitor_{city}_{strategy}"
+    criteria = CriteriaMapper.build_criteria(state, city, strategy)
+    key = criteria_hash(criteria)
+
+    entry = get_registered_list(db, key)
+    if entry and is_fresh(entry):
+        print(f"   🗂️ Registry hit: {list_name} -> List {entry.list_id}")
+        return entry.list_id
+
+    existing_lists = client.get_my_lists()
+    target_list_id = next((l['ListID'] for l in existing_lists if l.get('ListName') == list_name), None)
+
+    if not target_list_id:
+        print("   ⚠️ List not found. Creating it...")
+        target_list_id = client.create_dynamic_list(list_name, criteria)
+        if target_list_id:
+            client.set_list_automation(target_list_id)
+            # Give PropertyRadar a moment to populate the new list
+            time.sleep(2)
+
+    if target_list_id:
+        register_list(db, key, target_list_id, list_name)
+    return target_list_id
+
+# --- BACKGROUND RECONCILE JOB ---
+def reconcile_list_registry(client=None):
+    """
+    One pass: re-verifies every registry entry against a single get_my_lists
+    call. Entries whose list still exists are refreshed; entries whose list
+    was deleted in PropertyRadar are dropped.
+    """
+    client = client or PropertyRadarClient()
+    db = next(get_db())
+    try:
+        remote = client.get_my_lists()
+        if not remote:
+            # get_my_lists swallows errors and returns [] - never wipe the registry on that
+            print("   ⚠️ Registry reconcile skipped: no lists returned.")
+            return
+
+        remote_ids = {l.get('ListID') for l in remote}
+        now = datetime.now(timezone.utc)
+        refreshed, dropped = 0, 0
+
+        for entry in db.query(RadarList).all():
+            if entry.list_id in remote_ids:
+                entry.verified_at = now
+                refreshed += 1
+            else:
+                db.delete(entry)
+                dropped += 1
+
+        db.commit()
+        print(f"   🗂️ Registry reconciled. Refreshed: {refreshed}, Dropped: {dropped}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Registry reconcile error: {e}")
+    finally:
+        db.close()
+
+def start_list_registry_reconciler(interval_minutes=None):
+    """
+    Runs reconcile_list_registry every `interval_minutes` on a daemon thread.
+    Returns the threading.Event that stops it.
+    """
+    interval = (interval_minutes or Config.LIST_REGISTRY_RECONCILE_MINUTES) * 60
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            reconcile_list_registry()
+
+    threading.Thread(target=loop, name="list-registry-reconciler", daemon=True).start()
+    return stop
@@ -0,0 +1,124 @@
+import time
+import threading
+from collections import defaultdict
+
+from app.core.config import Config
+
+class _Flight:
+    """One in-progress upstream scan that identical requests wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.stale = False # Set if leads were saved while it ran
+
+class ScanResultCache:
+    """
+    In-process cache of scan summaries keyed by (state, city, strategy).
+
+    - Entries expire after `ttl_seconds`.
+    - Identical scans that arrive while one is already running wait for it
+      and share its result (one upstream fetch + DB diff for all of them).
+    - invalidate_radar_ids() drops every cached scan that lists any of the
+      given leads, so a lead bought by enrichment never shows up as "new".
+
+    Each API worker process holds its own cache.
+    """
+
+    def __init__(self, ttl_seconds: float = None):
+        self.ttl = Config.SCAN_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}                    # key -> (expires_at, result)
+        self._keys_by_radar_id = defaultdict(set)
+        self._in_flight = {}                  # key -> _Flight
+
+    @staticmethod
+    def make_key(state, city, strategy):
+        return (state.strip().upper(), (city or "").strip().upper(), strategy)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached result for `key`, joining or starting the upstream scan if needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                print(f"   ⚡ Scan cache hit: {key}")
+                return entry[1]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            print(f"   ⏳ Joining in-flight scan: {key}")
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if flight.error is None and not flight.stale and "error" not in flight.result:
+                    self._store(key, flight.result)
+            flight.done.set()
+
+        return flight.result
+
+    def put(self, key, result):
+        with self._lock:
+            self._store(key, result)
+
+    def _store(self, key, result):
+        # Caller holds the lock
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        for rid in self._radar_ids(result):
+            self._keys_by_radar_id[rid].add(key)
+
+    def _drop(self, key):
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return
+        for rid in self._radar_ids(entry[1]):
+            keys = self._keys_by_radar_id.get(rid)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_radar_id[rid]
+
+    @staticmethod
+    def _radar_ids(result):
+        for lead in result.get("leads", []):
+            yield lead["id"]
+        for lead in result.get("purchased_leads", []):
+            yield lead["radar_id"]
+
+    def invalidate_radar_ids(self, radar_ids):
+        """Drops every cached scan containing any of these leads."""
+        with self._lock:
+            keys = set()
+            for rid in radar_ids:
+                keys |= self._keys_by_radar_id.get(rid, set())
+            for key in keys:
+                self._drop(key)
+            # A scan running right now may have diffed before these leads were saved
+            for flight in self._in_flight.values():
+                flight.stale = True
+
+        if keys:
+            print(f"   🧹 Invalidated {len(keys)} cached scan(s).")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_radar_id.clear()
+
+# Process-wide cache shared by all scan requests
+scan_cache = ScanResultCache()
@@ -1,21 +1,60 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.database.database import engine, Base
+from app.database.migrations import run_migrations
 
 # Import our modular routers
 # Added 'webhooks' to the list
-from app.api.routes import search, history, auth, campaigns, messages, webhooks
+from app.api.routes import search, history, auth, campaigns, messages, webhooks, export
 
 from app.api.dependencies import get_current_user # <--- Import security dependency
+from app.domain.list_registry import start_list_registry_reconciler
+from app.services.twilio_gateway import init_gateway, shutdown_gateway
+from app.services.status_callbacks import start_status_flusher, status_buffer
+from app.core.security import init_password_hasher, shutdown_password_hasher
+from app.domain.harvest import close_async_radar_client
+from app.core.config import Config
 
 # --- DATABASE INIT ---
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+# --- LIFESPAN (Background Jobs) ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keeps the scanner's list registry in sync with PropertyRadar
+    stop_reconciler = start_list_registry_reconciler()
+
+    # One pooled Twilio client for every send in this process
+    gateway = init_gateway()
+    if gateway and Config.TWILIO_ASYNC:
+        await gateway.open_async()
+
+    # Writes buffered Twilio delivery status callbacks in batches
+    stop_status_flusher = start_status_flusher()
+
+    # Process pool for bcrypt (login / signup), started before the first request
+    await asyncio.to_thread(init_password_hasher, True)
+
+    yield
+
+    stop_reconciler.set()
+    stop_status_flusher.set()
+    status_buffer.wakeup.set()
+    if gateway:
+        await gateway.aclose()
+    shutdown_gateway()
+    shutdown_password_hasher()
+    await close_async_radar_client()
 
 # Initialize the Application
 app = FastAPI(
     title="Property Automation API",
     description="The backend engine for searching and enriching property leads.",
-    version="2.1.0"
+    version="2.1.0",
+    lifespan=lifespan
 )
 
 # --- CORS SETTINGS ---
@@ -30,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Paginated lists (history leads)
 )
 
 # 1. Auth Router (Public)
@@ -60,6 +100,11 @@ app.include_router(
     dependencies=[Depends(get_current_user)]
 )
 
+app.include_router(
+    export.router,
+    dependencies=[Depends(get_current_user)]
+)
+
 # --- ROOT ENDPOINT ---
 @app.get("/")
 def health_check():
@@ -1,117 +1,139 @@
-import time
-import json
+from collections import defaultdict
+from sqlalchemy import insert, update, case, func
 from sqlalchemy.orm import Session
-from twilio.rest import Client
 
-from app.database.models import Campaign, CampaignLead, Message, Lead
+from app.database.models import CampaignLead, Message
+from app.database.repository import roster_status_deltas, bump_campaign_stats
 from app.core.config import Config
+from app.services.sms_sender import SmsSender
+from app.services.twilio_gateway import get_gateway
+from app.services.templates import compile_template
+from app.utils.phone_numbers import primary_phone
 
-def launch_campaign_task(campaign_id: int, db: Session):
+def twilio_client():
+    """The process-wide pooled Twilio client, or None if Twilio isn't configured."""
+    gateway = get_gateway()
+    return gateway.client if gateway else None
+
+def send_campaign_batch(db: Session, items: list, client=None):
     """
-    Executes a campaign background task.
-    Iterates through queued leads, parses templates, and sends SMS via Twilio.
+    Sends one batch of claimed roster rows (see app.domain.campaign_queue).
+    Renders templates, sends SMS via Twilio concurrently (paced by the SMS
+    token bucket) and records outcomes in batches. Rows may belong to different
+    campaigns; each item needs its 'lead' and 'campaign' loaded.
     """
-    
-    # 1. Fetch Campaign Details
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
-        print(f"[ERROR] Campaign ID {campaign_id} not found. Aborting task.")
-        return
-
-    # 2. Initialize Twilio Client
-    client = None
-    if Config.TWILIO_SID and Config.TWILIO_TOKEN:
-        try:
-            client = Client(Config.TWILIO_SID, Config.TWILIO_TOKEN)
-        except Exception as e:
-            print(f"[ERROR] Twilio initialization failed: {e}")
-
-    # 3. Get 'Queued' Leads
-    items = db.query(CampaignLead).filter(
-        CampaignLead.campaign_id == campaign_id,
-        CampaignLead.status == "queued"
-    ).all()
-
-    print(f"[INFO] Starting Campaign '{campaign.name}' (ID: {campaign.id}). Lead count: {len(items)}")
-
-    # 4. Processing Loop
+    if client is None:
+        client = twilio_client()
+
+    # 1. Prepare Messages
+    prepared = {}   # roster id -> (campaign id, lead id, body, phone)
+    jobs = []
+    skipped = []
+    outcomes = OutcomeBuffer(db)
+    by_campaign = defaultdict(list)
     for item in items:
-        lead = item.lead
-        
-        # --- A. Template Parsing ---
-        first_name = "Homeowner"
-        if lead.owner_name:
-            first_name = lead.owner_name.split(" ")[0].title()
-
-        address_display = lead.address if lead.address else "your property"
-        city_display = lead.city if lead.city else "your area"
-
-        msg_body = campaign.template_body\
-            .replace("{name}", first_name)\
-            .replace("{address}", address_display)\
-            .replace("{city}", city_display)
-
-        # --- B. Phone Extraction ---
-        target_phone = None
-        if lead.phone_numbers:
-            phones = lead.phone_numbers
-            # Handle potential JSON string format from DB
-            if isinstance(phones, str):
-                try: 
-                    phones = json.loads(phones)
-                except json.JSONDecodeError: 
-                    phones = []
-            
-            # Select primary number
-            if isinstance(phones, list) and len(phones) > 0:
-                target_phone = phones[0] 
-
-        # --- C. Send SMS ---
-        status = "failed"
-        error_msg = None
-        sid = None
-        
-        if client and target_phone and Config.TWILIO_PHONE:
-            try:
-                message = client.messages.create(
-                    body=msg_body,
-                    from_=Config.TWILIO_PHONE,
-                    to=target_phone
-                )
-                status = "queued"
-                sid = message.sid
-                print(f"[INFO] Sent to lead {lead.radar_id} ({target_phone}). SID: {sid}")
-            except Exception as e:
-                status = "failed"
-                error_msg = str(e)
-                print(f"[ERROR] Failed to send to {lead.radar_id}: {e}")
-        else:
-            if not target_phone: 
-                error_msg = "No valid phone number found"
-            elif not Config.TWILIO_PHONE: 
-                error_msg = "Twilio sender number not configured"
-            
-            print(f"[WARN] Skipping lead {lead.radar_id}: {error_msg}")
-
-        # --- D. Persist Log ---
-        new_msg = Message(
-            campaign_id=campaign.id,
-            lead_id=lead.radar_id,
-            direction="outbound-api",
-            body=msg_body,
-            status=status,
-            twilio_sid=sid,
-            to_phone=target_phone,
-            error_message=error_msg
-        )
-        db.add(new_msg)
-        
-        # --- E. Update Status ---
+        by_campaign[item.campaign_id].append(item)
+
+    for campaign_items in by_campaign.values():
+        # --- A. Template Rendering (parsed once per campaign) ---
+        template = compile_template(campaign_items[0].campaign.template_body)
+        bodies = template.render_many([item.lead for item in campaign_items])
+
+        for item, msg_body in zip(campaign_items, bodies):
+            lead = item.lead
+
+            # --- B. Phone Extraction ---
+            target_phone = primary_phone(lead.phone_numbers)
+
+            prepared[item.id] = (item.campaign_id, item.lead_id, msg_body, target_phone)
+
+            if client and target_phone and Config.TWILIO_PHONE:
+                jobs.append((item.id, target_phone, msg_body))
+            else:
+                error_msg = None
+                if not target_phone:
+                    error_msg = "No valid phone number found"
+                elif not Config.TWILIO_PHONE:
+                    error_msg = "Twilio sender number not configured"
+
+                print(f"[WARN] Skipping lead {lead.radar_id}: {error_msg}")
+                skipped.append((item.id, {"status": "failed", "sid": None, "error": error_msg}))
+
+    # Flushing commits (expiring the ORM rows), so only record once preparation is done
+    for roster_id, outcome in skipped:
+        outcomes.add(roster_id, prepared[roster_id], outcome)
+
+    # 2. Send Concurrently (Rate Limited by the SMS token bucket)
+    if jobs:
+        sender = SmsSender(client, Config.TWILIO_PHONE)
+        for roster_id, outcome in sender.send_all(jobs):
+            lead_id = prepared[roster_id][1]
+            if outcome["status"] == "failed":
+                print(f"[ERROR] Failed to send to {lead_id}: {outcome['error']}")
+            else:
+                print(f"[INFO] Sent to lead {lead_id} ({prepared[roster_id][3]}). SID: {outcome['sid']}")
+            outcomes.add(roster_id, prepared[roster_id], outcome)
+
+    outcomes.flush()
+
+class OutcomeBuffer:
+    """
+    Collects send outcomes and persists them in batches: one bulk INSERT into
+    'messages' plus one UPDATE of 'campaign_leads' (and the campaign's
+    counters) per flush, in one commit.
+
+    Until its batch is flushed a roster row stays 'sending', so a crash never
+    puts it back in the queue: recover_stale_claims() settles it without
+    sending again.
+    """
+
+    def __init__(self, db: Session, flush_size: int = None):
+        self.db = db
+        self.flush_size = flush_size or Config.CAMPAIGN_FLUSH_SIZE
+        self.messages = []
+        self.statuses = {}  # roster id -> 'sent' / 'failed'
+
+    def add(self, roster_id, prepared, outcome: dict):
+        campaign_id, lead_id, msg_body, target_phone = prepared
+
+        # --- D. Log ---
+        self.messages.append({
+            "campaign_id": campaign_id,
+            "lead_id": lead_id,
+            "direction": "outbound-api",
+            "body": msg_body,
+            "status": outcome["status"],
+            "twilio_sid": outcome["sid"],
+            "to_phone": target_phone,
+            "error_message": outcome["error"],
+        })
+
+        # --- E. Status ---
         # Mark as sent if Twilio accepted the request
-        item.status = "sent" if status in ["sent", "queued"] else "failed"
-        db.commit()
+        self.statuses[roster_id] = "sent" if outcome["status"] in ["sent", "queued"] else "failed"
+
+        if len(self.statuses) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if not self.statuses:
+            return
+        self.db.execute(insert(Message), self.messages)
 
-        # Rate Limiting (0.5s delay)
-        time.sleep(0.5)
+        # Only rows still 'sending' move; one settled meanwhile (e.g. by
+        # recover_stale_claims) keeps its status and its counters
+        moved = self.db.execute(
+            update(CampaignLead)
+            .where(CampaignLead.id.in_(list(self.statuses)), CampaignLead.status == "sending")
+            .values(status=case(self.statuses, value=CampaignLead.id), claimed_at=None, last_activity_at=func.now())
+            .returning(CampaignLead.campaign_id, CampaignLead.status)
+            .execution_options(synchronize_session=False)
+        ).all()
 
-    print(f"[INFO] Campaign '{campaign.name}' execution completed.")
+        stats = defaultdict(dict)  # campaign id -> counter deltas
+        for campaign_id, status in moved:
+            roster_status_deltas("sending", status, stats[campaign_id])
+        for campaign_id, deltas in stats.items():
+            bump_campaign_stats(self.db, campaign_id, deltas)
+        self.db.commit()
+        self.messages, self.statuses = [], {}
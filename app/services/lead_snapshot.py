@@ -0,0 +1,211 @@
+import os
+import json
+import uuid
+from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from sqlalchemy import select, func, case, cast, or_, and_, Float
+from sqlalchemy.orm import Session
+
+from app.core.config import Config
+from app.database.models import Lead
+from app.utils.db_lists import parse_db_list
+
+# --- LEAD SNAPSHOTS (Parquet) ---
+# Analysts read leads from a partitioned Parquet dataset instead of the API /
+# production Postgres:
+#
+#   <SNAPSHOT_DIR>/state=VA/city=RICHMOND/part-<run>-<n>.parquet
+#   <SNAPSHOT_DIR>/_snapshot_state.json      (watermark, ignored by readers)
+#
+# Each run appends the leads whose updated_at moved past the watermark, so a
+# changed lead can exist in several files (even partitions, if it moved
+# city). read_lead_snapshot() keeps the newest version of each lead.
+
+STATE_FILE = "_snapshot_state.json"
+
+# Columns copied as-is from 'leads'
+LEAD_COLUMNS = [
+    ("radar_id", Lead.radar_id, pa.string()),
+    ("address", Lead.address, pa.string()),
+    ("zip_code", Lead.zip_code, pa.string()),
+    ("beds", Lead.beds, pa.int32()),
+    ("baths", Lead.baths, pa.float64()),
+    ("sq_ft", Lead.sq_ft, pa.int32()),
+    ("year_built", Lead.year_built, pa.int32()),
+    ("lot_sq_ft", Lead.lot_sq_ft, pa.int32()),
+    ("property_type", Lead.property_type, pa.string()),
+    ("estimated_value", Lead.estimated_value, pa.int64()),
+    ("estimated_equity", Lead.estimated_equity, pa.int64()),
+    ("tax_delinquent", Lead.tax_delinquent, pa.bool_()),
+    ("owner_name", Lead.owner_name, pa.string()),
+    ("is_purchased", Lead.is_purchased, pa.bool_()),
+    ("updated_at", Lead.updated_at, pa.timestamp("us", tz="UTC")),
+]
+
+# Fields pulled out of raw_property_data by Postgres (->>), so the JSON blob
+# itself never leaves the database: (column, PropertyRadar key, kind)
+RAW_FIELDS = [
+    ("county", "County", "text"),
+    ("apn", "APN", "text"),
+    ("last_transfer_date", "LastTransferRecDate", "text"),
+    ("assessed_value", "AssessedValue", "number"),
+    ("equity_percent", "EquityPercent", "number"),
+    ("total_loan_balance", "TotalLoanBalance", "number"),
+    ("last_transfer_value", "LastTransferValue", "number"),
+    ("is_high_equity", "isHighEquity", "flag"),
+    ("in_foreclosure", "inForeclosure", "flag"),
+    ("is_listed_for_sale", "isListedForSale", "flag"),
+    ("is_same_mailing_or_exempt", "isSameMailingOrExempt", "flag"),
+]
+RAW_TYPES = {"text": pa.string(), "number": pa.float64(), "flag": pa.bool_()}
+
+# JSON lists normalized to list<string>
+LIST_COLUMNS = [
+    ("phone_numbers", Lead.phone_numbers),
+    ("email_addresses", Lead.email_addresses),
+]
+
+PARTITION_SCHEMA = pa.schema([("state", pa.string()), ("city", pa.string())])
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [(name, arrow_type) for name, _, arrow_type in LEAD_COLUMNS]
+    + [(name, RAW_TYPES[kind]) for name, _, kind in RAW_FIELDS]
+    + [(name, pa.list_(pa.string())) for name, _ in LIST_COLUMNS]
+    + list(PARTITION_SCHEMA)
+)
+
+NUMBER_PATTERN = r"^\s*-?[0-9]+(\.[0-9]+)?\s*$"
+
+def _raw_field(key, kind):
+    value = Lead.raw_property_data[key].as_string()
+    if kind == "number":
+        # Non-numeric text ('N/A', '') becomes NULL instead of failing the cast
+        return case((value.regexp_match(NUMBER_PATTERN), cast(value, Float)), else_=None)
+    if kind == "flag":
+        return case((value.is_(None), None), else_=func.lower(value).in_(["1", "true"]))
+    return value
+
+def snapshot_query(watermark=None, cutoff=None):
+    """Leads changed after `watermark` ((updated_at, radar_id)) and up to `cutoff`, oldest change first."""
+    columns = [column.label(name) for name, column, _ in LEAD_COLUMNS]
+    columns += [_raw_field(key, kind).label(name) for name, key, kind in RAW_FIELDS]
+    columns += [column.label(name) for name, column in LIST_COLUMNS]
+    columns += [Lead.state.label("state"), Lead.city.label("city")]
+
+    query = select(*columns)
+    if watermark:
+        after_at, after_id = watermark
+        query = query.where(or_(
+            Lead.updated_at > after_at,
+            and_(Lead.updated_at == after_at, Lead.radar_id > after_id)
+        ))
+    if cutoff:
+        query = query.where(Lead.updated_at <= cutoff)
+    return query.order_by(Lead.updated_at, Lead.radar_id)
+
+def _string_list(value):
+    return [str(v) for v in parse_db_list(value)]
+
+def to_record_batch(rows) -> pa.RecordBatch:
+    """One batch of snapshot_query rows -> an Arrow batch in SNAPSHOT_SCHEMA."""
+    list_names = {name for name, _ in LIST_COLUMNS}
+    columns = list(zip(*rows)) if rows else [[] for _ in SNAPSHOT_SCHEMA]
+    arrays = []
+    for field, values in zip(SNAPSHOT_SCHEMA, columns):
+        if field.name in list_names:
+            values = [_string_list(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=SNAPSHOT_SCHEMA)
+
+def load_state(snapshot_dir):
+    path = os.path.join(snapshot_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_state(snapshot_dir, state):
+    """Atomic replace, so a crash never leaves a half-written watermark."""
+    path = os.path.join(snapshot_dir, STATE_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+def export_lead_snapshot(db: Session, snapshot_dir=None, full=False, batch_size=None) -> int:
+    """
+    Appends every lead changed since the last run to the Parquet dataset and
+    advances the watermark. full=True ignores the watermark (re-exports all
+    leads; readers still dedupe). Returns the number of leads written.
+
+    Rows are streamed from a server-side cursor into the Parquet writer one
+    record batch at a time, so memory doesn't grow with the table.
+    """
+    snapshot_dir = snapshot_dir or Config.SNAPSHOT_DIR
+    batch_size = batch_size or Config.SNAPSHOT_BATCH_SIZE
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    state = None if full else load_state(snapshot_dir)
+    watermark = None
+    if state and state.get("updated_at"):
+        watermark = (datetime.fromisoformat(state["updated_at"]), state["radar_id"])
+
+    db_now = db.execute(select(func.now())).scalar()
+    cutoff = db_now - timedelta(seconds=Config.SNAPSHOT_LAG_SECONDS)
+
+    result = db.execute(
+        snapshot_query(watermark, cutoff).execution_options(yield_per=batch_size)
+    )
+
+    progress = {"rows": 0, "last": None}
+
+    def batches():
+        for rows in result.partitions():
+            batch = to_record_batch(rows)
+            progress["rows"] += batch.num_rows
+            progress["last"] = (rows[-1].updated_at, rows[-1].radar_id)
+            print(f"   📦 {progress['rows']} leads written...")
+            yield batch
+
+    run_id = f"{db_now.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(SNAPSHOT_SCHEMA, batches()),
+        snapshot_dir,
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+    if progress["last"]:
+        last_at, last_id = progress["last"]
+        state = {"updated_at": last_at.isoformat(), "radar_id": last_id}
+    state = dict(state or {}, last_run_at=db_now.isoformat(), last_run_rows=progress["rows"])
+    save_state(snapshot_dir, state)
+    return progress["rows"]
+
+def read_lead_snapshot(snapshot_dir=None, filter=None, columns=None, latest_only=True) -> pa.Table:
+    """
+    Loads the snapshot as an Arrow table. `filter` is a pyarrow.dataset
+    expression, e.g. (ds.field("state") == "VA") & (ds.field("city") == "RICHMOND"),
+    applied while scanning, so unrelated partitions are never opened.
+
+    latest_only keeps one row per lead (its newest version); pass False to
+    get every appended version straight from the files, without the sort.
+    """
+    snapshot_dir = snapshot_dir or Config.SNAPSHOT_DIR
+    dataset = ds.dataset(snapshot_dir, format="parquet", partitioning="hive", schema=SNAPSHOT_SCHEMA)
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ["radar_id", "updated_at"]))
+    table = dataset.to_table(filter=filter, columns=columns)
+    if not latest_only or table.num_rows == 0:
+        return table
+
+    # Newest version first within each lead, then keep the first row per lead
+    table = table.sort_by([("radar_id", "ascending"), ("updated_at", "descending")])
+    ids = table.column("radar_id").combine_chunks()
+    first = pc.not_equal(ids[1:], ids[:-1])
+    keep = pa.concat_arrays([pa.array([True]), first.fill_null(True)])
+    return table.filter(keep)
@@ -1,10 +1,10 @@
-import json
 from sqlalchemy.orm import Session
-from sqlalchemy import cast, String # <--- NEW IMPORT
-from twilio.rest import Client
 
-from app.database.models import Message, Lead, CampaignLead, Campaign
+from app.database.models import Message, Lead, LeadPhone, CampaignLead, Campaign
+from app.utils.phone_numbers import normalize_phone, primary_phone
+from app.database.repository import roster_status_deltas, bump_campaign_stats, touch_roster_activity
 from app.core.config import Config
+from app.services.twilio_gateway import get_gateway
 from app.api.schemas import MessageCreate
 
 def send_one_off_message(payload: MessageCreate, db: Session):
@@ -18,30 +18,16 @@ def send_one_off_message(payload: MessageCreate, db: Session):
     if not lead:
         raise ValueError(f"Lead {payload.lead_id} not found.")
 
-    # 2. Phone Number Logic (The Safety Net)
-    target_phone = None
-    
-    if lead.phone_numbers:
-        # DB might store as JSON string or Python list
-        phones = lead.phone_numbers
-        if isinstance(phones, str):
-            try:
-                phones = json.loads(phones)
-            except json.JSONDecodeError:
-                phones = []
-        
-        # We default to the FIRST number.
-        if isinstance(phones, list) and len(phones) > 0:
-            target_phone = phones[0]
+    # 2. Phone Number Logic (We default to the FIRST number)
+    target_phone = primary_phone(lead.phone_numbers)
 
     if not target_phone:
         raise ValueError("This lead has no valid phone numbers.")
 
-    # 3. Initialize Twilio
-    if not Config.TWILIO_SID or not Config.TWILIO_TOKEN or not Config.TWILIO_PHONE:
+    # 3. Shared Twilio Gateway (pooled connections)
+    gateway = get_gateway()
+    if not gateway or not Config.TWILIO_PHONE:
         raise ValueError("Twilio credentials are not configured.")
-
-    client = Client(Config.TWILIO_SID, Config.TWILIO_TOKEN)
     
     # 4. Send Message
     status = "failed"
@@ -50,11 +36,7 @@ def send_one_off_message(payload: MessageCreate, db: Session):
     cost = None 
 
     try:
-        message = client.messages.create(
-            body=payload.body,
-            from_=Config.TWILIO_PHONE,
-            to=target_phone
-        )
+        message = gateway.send(target_phone, payload.body)
         
         # Use actual status from Twilio (usually "queued")
         status = message.status 
@@ -84,6 +66,7 @@ def send_one_off_message(payload: MessageCreate, db: Session):
         cost=cost 
     )
     db.add(new_msg)
+    touch_roster_activity(db, payload.campaign_id, lead.radar_id)
     
     # 6. Update Campaign Status
     if payload.campaign_id and status in ["queued", "sent"]:
@@ -92,8 +75,12 @@ def send_one_off_message(payload: MessageCreate, db: Session):
             CampaignLead.lead_id == lead.radar_id
         ).first()
         if roster_item:
+            bump_campaign_stats(db, payload.campaign_id, roster_status_deltas(roster_item.status, "sent"))
             roster_item.status = "sent"
 
+    if payload.campaign_id and cost:
+        bump_campaign_stats(db, payload.campaign_id, {"total_cost": cost})
+
     db.commit()
     db.refresh(new_msg)
     
@@ -119,9 +106,9 @@ def handle_inbound_sms(data: dict, db: Session):
         return
 
     # 2. Find ALL Leads with this number (not just the first one)
-    # We cast to String to allow LIKE search on JSON array
-    leads = db.query(Lead).filter(
-        cast(Lead.phone_numbers, String).like(f"%{from_number}%")
+    # Indexed equality lookup on the normalized phone table
+    leads = db.query(Lead).join(LeadPhone, LeadPhone.lead_id == Lead.radar_id).filter(
+        LeadPhone.phone == normalize_phone(from_number)
     ).all()
     
     if not leads:
@@ -169,6 +156,7 @@ def handle_inbound_sms(data: dict, db: Session):
     
     try:
         db.add(new_message)
+        touch_roster_activity(db, campaign_id, target_lead_id)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -183,6 +171,7 @@ def handle_inbound_sms(data: dict, db: Session):
         ).first()
         
         if roster_entry:
+            bump_campaign_stats(db, campaign_id, roster_status_deltas(roster_entry.status, 'replied'))
             roster_entry.status = 'replied'
             db.commit()
 
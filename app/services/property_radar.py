@@ -1,16 +1,84 @@
 import requests
 import json
 import time
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.core.config import Config
+from app.services.rate_limiter import property_radar_limiter, parse_retry_after
+
+# --- SHARED TRANSPORT ---
+# One pooled, keep-alive session for the whole process. Every client instance
+# (scanner, enricher, CLI) reuses the same TCP/TLS connections instead of
+# opening a new one per call.
+_session = None
+_session_lock = threading.Lock()
+
+def build_session(pool_size=None, max_retries=None):
+    """
+    Creates a requests Session with sized connection pools and
+    transport-level retries for connection errors and 5xx responses.
+    Only idempotent methods (GET/PUT) are retried, so a purchase POST
+    is never sent twice. 429s are left to the shared rate limiter.
+    """
+    pool_size = pool_size or Config.PROPERTY_RADAR_POOL_SIZE
+    retries = Retry(
+        total=Config.PROPERTY_RADAR_MAX_RETRIES if max_retries is None else max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_shared_session():
+    """Returns the process-wide PropertyRadar session (created on first use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+def first_result(data):
+    """Handle API returning a list vs single object."""
+    results = data.get('results', data)
+
+    if isinstance(results, list) and len(results) > 0:
+        return results[0]
+    return results if isinstance(results, dict) else None
 
 class PropertyRadarClient:
     BASE_URL = "https://api.propertyradar.com/v1"
 
-    def __init__(self):
+    def __init__(self, base_url=None, session=None):
         self.headers = {
             "Authorization": f"Bearer {Config.PROPERTY_RADAR_TOKEN}",
             "Content-Type": "application/json"
         }
+        if base_url:
+            self.BASE_URL = base_url
+        self.session = session or get_shared_session()
+        self.timeout = (Config.PROPERTY_RADAR_CONNECT_TIMEOUT, Config.PROPERTY_RADAR_READ_TIMEOUT)
+        self.limiter = property_radar_limiter
+
+    def _request(self, method, url, **kwargs):
+        """
+        Sends one API call through the shared rate limiter.
+        A 429 slows every caller down and the call is retried after Retry-After.
+        """
+        for _ in range(Config.PROPERTY_RADAR_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.request(method, url, headers=self.headers, timeout=self.timeout, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success()
+                return response
+            self.limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+        return response
 
     # --- 1. LIST MANAGEMENT ---
     def create_dynamic_list(self, name, criteria):
@@ -24,7 +92,7 @@ class PropertyRadarClient:
         }
         try:
             print(f"🔨 Creating List: {name}...")
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, json=payload)
             response.raise_for_status()
             data = response.json()
             return data.get('results', [{}])[0].get('ListID')
@@ -37,7 +105,7 @@ class PropertyRadarClient:
         """Fetches all lists."""
         url = f"{self.BASE_URL}/lists"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url)
             response.raise_for_status()
             return response.json().get('results', [])
         except Exception as e:
@@ -56,27 +124,45 @@ class PropertyRadarClient:
         }
         try:
             print(f"⚙️ Configuring Automation for List {list_id}...")
-            requests.put(url, headers=self.headers, json=payload).raise_for_status()
+            self._request("PUT", url, json=payload).raise_for_status()
             return True
         except Exception as e:
             print(f"❌ Automation Error: {e}")
             return False
 
     # --- 3. HARVEST ---
-    def get_new_list_items(self, list_id, added_since=None, limit=1000):
+    def iter_list_items(self, list_id, added_since=None, page_size=1000):
+        """
+        Walks every page of a list (Start/Limit offsets) and yields items
+        as each page arrives, so large lists are neither truncated nor
+        held in memory all at once.
+        """
         url = f"{self.BASE_URL}/lists/{list_id}/items"
-        params = {"Limit": str(limit)} 
+        params = {"Limit": str(page_size)}
         if added_since: params["AddedSince"] = added_since
 
-        try:
-            print(f"📡 Checking List {list_id}...")
-            response = requests.get(url, headers=self.headers, params=params)
+        start = 0
+        print(f"📡 Checking List {list_id}...")
+        while True:
+            response = self._request("GET", url, params={**params, "Start": str(start)})
             response.raise_for_status()
             data = response.json()
-            return data.get('results', data)
-        except Exception as e:
-            print(f"❌ List Fetch Error: {e}")
-            return []
+            page = data.get('results', data)
+
+            if not isinstance(page, list) or not page:
+                return
+            yield from page
+
+            if len(page) < page_size:
+                return
+            start += len(page)
+
+    def get_new_list_items(self, list_id, added_since=None, limit=1000):
+        """
+        Every item of the list as one list (`limit` is the page size). A
+        failed page raises, so a partial list is never taken for the whole.
+        """
+        return list(self.iter_list_items(list_id, added_since=added_since, page_size=limit))
 
     # --- 4. DATA DETAILS & UNLOCK ---
     def get_property_owners(self, radar_id):
@@ -84,7 +170,7 @@ class PropertyRadarClient:
         url = f"{self.BASE_URL}/properties/{radar_id}/persons"
         params = {"Purchase": "1", "Fields": "overview"} 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._request("GET", url, params=params)
             data = response.json()
             return data.get('results', data)
         except: return []
@@ -94,7 +180,7 @@ class PropertyRadarClient:
         url = f"{self.BASE_URL}/persons/{person_key}/{field}"
         params = {"Purchase": "1"}
         try:
-            response = requests.post(url, headers=self.headers, params=params, json={}) #DEBUG
+            response = self._request("POST", url, params=params, json={}) #DEBUG
             if response.status_code == 200:
                 data = response.json()
                 results = data.get('results', data)
@@ -118,16 +204,10 @@ class PropertyRadarClient:
         params = {"Purchase": "1", "Fields": "Overview"} 
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._request("GET", url, params=params)
             # No raise_for_status() here to avoid crashing the loop on minor errors
             
-            data = response.json()
-            # Handle API returning a list vs single object
-            results = data.get('results', data)
-            
-            if isinstance(results, list) and len(results) > 0:
-                return results[0]
-            return results if isinstance(results, dict) else None
+            return first_result(response.json())
             
         except Exception as e:
             print(f"⚠️ Error fetching property details for {radar_id}: {e}")
@@ -0,0 +1,137 @@
+import httpx
+
+from app.core.config import Config
+from app.services.property_radar import PropertyRadarClient, first_result
+from app.services.rate_limiter import property_radar_limiter, parse_retry_after
+
+class AsyncPropertyRadarClient:
+    """
+    asyncio twin of PropertyRadarClient for the read/enrich calls.
+    Shares the process-wide rate limiter with the sync client, so both
+    together never exceed the configured request rate.
+
+    Use as an async context manager so the connection pool is closed:
+        async with AsyncPropertyRadarClient() as client: ...
+    """
+    BASE_URL = PropertyRadarClient.BASE_URL
+
+    def __init__(self, base_url=None):
+        if base_url:
+            self.BASE_URL = base_url
+        self.limiter = property_radar_limiter
+        self.http = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {Config.PROPERTY_RADAR_TOKEN}",
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(Config.PROPERTY_RADAR_READ_TIMEOUT, connect=Config.PROPERTY_RADAR_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=Config.PROPERTY_RADAR_POOL_SIZE,
+                max_keepalive_connections=Config.PROPERTY_RADAR_POOL_SIZE
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=Config.PROPERTY_RADAR_MAX_RETRIES),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def _request(self, method, url, **kwargs):
+        """Same contract as PropertyRadarClient._request, without blocking the loop."""
+        for _ in range(Config.PROPERTY_RADAR_MAX_RETRIES + 1):
+            await self.limiter.acquire_async()
+            response = await self.http.request(method, url, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success()
+                return response
+            self.limiter.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    # --- 1. LIST MANAGEMENT ---
+    async def get_my_lists(self):
+        """Fetches all lists."""
+        url = f"{self.BASE_URL}/lists"
+        try:
+            response = await self._request("GET", url)
+            response.raise_for_status()
+            return response.json().get('results', [])
+        except Exception as e:
+            print(f"❌ Get Lists Error: {e}")
+            return []
+
+    # --- 3. HARVEST ---
+    async def iter_list_items(self, list_id, added_since=None, page_size=1000):
+        """Async generator twin of PropertyRadarClient.iter_list_items."""
+        url = f"{self.BASE_URL}/lists/{list_id}/items"
+        params = {"Limit": str(page_size)}
+        if added_since: params["AddedSince"] = added_since
+
+        start = 0
+        print(f"📡 Checking List {list_id}...")
+        while True:
+            response = await self._request("GET", url, params={**params, "Start": str(start)})
+            response.raise_for_status()
+            data = response.json()
+            page = data.get('results', data)
+
+            if not isinstance(page, list) or not page:
+                return
+            for item in page:
+                yield item
+
+            if len(page) < page_size:
+                return
+            start += len(page)
+
+    async def get_new_list_items(self, list_id, added_since=None, limit=1000):
+        """Async twin of PropertyRadarClient.get_new_list_items; a failed page raises."""
+        return [item async for item in self.iter_list_items(list_id, added_since=added_since, page_size=limit)]
+
+    # --- 4. DATA DETAILS & UNLOCK ---
+    async def get_property_owners(self, radar_id):
+        """Get Names & Keys (Purchase=1 required to see them)"""
+        url = f"{self.BASE_URL}/properties/{radar_id}/persons"
+        params = {"Purchase": "1", "Fields": "overview"}
+        try:
+            response = await self._request("GET", url, params=params)
+            data = response.json()
+            return data.get('results', data)
+        except Exception:
+            return []
+
+    async def unlock_contact_field(self, person_key, field="Phone"):
+        """Explicit POST to unlock data if missing"""
+        url = f"{self.BASE_URL}/persons/{person_key}/{field}"
+        params = {"Purchase": "1"}
+        try:
+            response = await self._request("POST", url, params=params, json={})
+            if response.status_code == 200:
+                data = response.json()
+                results = data.get('results', data)
+
+                if not results:
+                    print(f"      ⚠️ API returned empty 200 OK for {field}. Raw: {response.text}")
+
+                return results
+            print(f"      ❌ Unlock Error {response.status_code}: {response.text}")
+            return []
+        except Exception:
+            return []
+
+    # --- 5. PROPERTY DETAILS ---
+    async def get_property_data(self, radar_id):
+        """Fetches the full property record (Beds, Baths, Equity, etc.)."""
+        url = f"{self.BASE_URL}/properties/{radar_id}"
+        params = {"Purchase": "1", "Fields": "Overview"}
+
+        try:
+            response = await self._request("GET", url, params=params)
+            return first_result(response.json())
+        except Exception as e:
+            print(f"⚠️ Error fetching property details for {radar_id}: {e}")
+            return None
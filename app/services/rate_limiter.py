@@ -0,0 +1,106 @@
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from app.core.config import Config
+
+
+def parse_retry_after(value):
+    """
+    Converts a Retry-After header (seconds or HTTP date) into seconds to wait.
+    Returns None if the header is missing or unreadable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from both threads and asyncio.
+
+    The refill rate is adaptive: a throttled response (429) pauses every
+    caller until Retry-After has passed and halves the rate; each success
+    creeps it back up towards the configured ceiling.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate else max(0.1, self.max_rate / 10)
+        self.capacity = float(capacity) if capacity else max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token if one is available. Otherwise returns how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Blocks the calling thread until a token is available."""
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Waits (without blocking the event loop) until a token is available."""
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def on_throttled(self, retry_after: float = None):
+        """Called on a 429: pause everyone and slow down."""
+        with self._lock:
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+        print(f"   ⏳ Rate limited. Pausing {pause:.1f}s, rate now {self.rate:.2f}/s")
+
+    def on_success(self):
+        """Called on a non-throttled response: recover towards the ceiling."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+# One bucket for every PropertyRadar call in the process (sync and async)
+property_radar_limiter = TokenBucket(
+    rate=Config.PROPERTY_RADAR_RATE_PER_SECOND,
+    capacity=Config.PROPERTY_RADAR_BURST,
+)
+
+# One bucket for every outbound SMS in the process (all campaigns share the
+# account's rate). Each sending process takes its share of the account rate,
+# so N workers together stay at SMS_RATE_PER_SECOND.
+sms_limiter = TokenBucket(
+    rate=Config.SMS_RATE_PER_SECOND / Config.SMS_SENDING_PROCESSES,
+)
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from twilio.base.exceptions import TwilioRestException
+
+from app.core.config import Config
+from app.services.rate_limiter import sms_limiter
+from app.services.twilio_gateway import message_options
+
+class SmsSender:
+    """
+    Sends SMS through Twilio from a small pool of worker threads, paced by
+    the process-wide SMS token bucket (SMS_RATE_PER_SECOND).
+
+    Workers only talk to Twilio. Every outcome is handed back to the caller,
+    who owns the DB session and persists it.
+    """
+
+    def __init__(self, client, from_number, workers=None, limiter=None):
+        self.client = client
+        self.from_number = from_number
+        self.workers = workers or Config.SMS_SEND_WORKERS
+        self.limiter = limiter or sms_limiter
+
+    def send(self, to, body):
+        """
+        Sends one message. Never raises: returns {"status", "sid", "error"}
+        exactly as the campaign loop records them.
+        """
+        for _ in range(Config.SMS_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                message = self.client.messages.create(body=body, from_=self.from_number, to=to, **message_options())
+                self.limiter.on_success()
+                return {"status": "queued", "sid": message.sid, "error": None}
+            except TwilioRestException as e:
+                if e.status != 429:
+                    return {"status": "failed", "sid": None, "error": str(e)}
+                # Too Many Requests: slow every worker down, then retry
+                self.limiter.on_throttled()
+                error = str(e)
+            except Exception as e:
+                return {"status": "failed", "sid": None, "error": str(e)}
+
+        return {"status": "failed", "sid": None, "error": error}
+
+    def send_all(self, jobs):
+        """
+        Sends every job concurrently. `jobs` are (key, to, body) tuples.
+        Yields (key, outcome) as each send finishes.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.send, to, body): key for key, to, body in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
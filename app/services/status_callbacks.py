@@ -0,0 +1,199 @@
+import threading
+from sqlalchemy import update, select, case, cast, func, values, column, String, Integer, Float
+from sqlalchemy.orm import aliased
+
+from app.core.config import Config
+from app.database.database import get_db
+from app.database.models import Message
+from app.database.repository import bump_campaign_stats
+
+# --- TWILIO DELIVERY STATUS CALLBACKS ---
+# Callbacks arrive in bursts (several per message) and out of order. The
+# webhook only records them in memory; a background thread writes them with
+# one UPDATE ... FROM (VALUES ...) per flush, keyed by twilio_sid.
+#
+# A status never moves a message backwards: each status has a rank and the
+# UPDATE only applies if the new rank is higher than the stored one, so a
+# late 'sent' can't overwrite 'delivered'.
+
+STATUS_RANK = {
+    "accepted": 0, "scheduled": 0,
+    "queued": 1,
+    "sending": 2,
+    "sent": 3,
+    "delivered": 4, "undelivered": 4, "failed": 4, "canceled": 4,
+    "read": 5,
+}
+
+DELIVERED = {"delivered", "read"}
+
+def parse_price(value):
+    """Twilio prices are strings like '-0.00790' (charges are negative)."""
+    try:
+        return abs(float(value))
+    except (TypeError, ValueError):
+        return None
+
+class StatusBuffer:
+    """
+    Thread-safe latest-status-per-sid buffer. Keeps only the highest-ranked
+    status seen for each message until the next flush.
+    """
+
+    def __init__(self):
+        self._pending = {}  # sid -> {"status", "rank", "error", "cost", "attempts"}
+        self._lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def add(self, sid, status, error_code=None, price=None):
+        status = (status or "").lower()
+        if not sid or status not in STATUS_RANK:
+            return
+
+        entry = {
+            "status": status,
+            "rank": STATUS_RANK[status],
+            "error": f"Twilio error {error_code}" if error_code else None,
+            "cost": parse_price(price),
+            "attempts": 0,
+        }
+        with self._lock:
+            self._merge(sid, entry)
+            if len(self._pending) >= Config.STATUS_FLUSH_MAX:
+                self.wakeup.set()
+
+    def _merge(self, sid, entry):
+        current = self._pending.get(sid)
+        if current is None or entry["rank"] > current["rank"]:
+            if current:
+                entry["error"] = entry["error"] or current["error"]
+                entry["cost"] = entry["cost"] if entry["cost"] is not None else current["cost"]
+            self._pending[sid] = entry
+        else:
+            current["error"] = current["error"] or entry["error"]
+            if current["cost"] is None:
+                current["cost"] = entry["cost"]
+
+    def take(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self.wakeup.clear()
+        return batch
+
+    def requeue(self, batch):
+        """Puts back callbacks whose message isn't saved yet (merged with anything newer)."""
+        with self._lock:
+            for sid, entry in batch.items():
+                self._merge(sid, entry)
+
+    def __len__(self):
+        return len(self._pending)
+
+status_buffer = StatusBuffer()
+
+# Rows per UPDATE ... FROM (VALUES ...) statement (5 bind params each)
+FLUSH_CHUNK_SIZE = 2000
+
+def _stored_rank():
+    return case(
+        {status: rank for status, rank in STATUS_RANK.items()},
+        value=Message.status,
+        else_=-1
+    )
+
+def flush_status_updates(buffer: StatusBuffer = None) -> int:
+    """Writes every buffered callback in one transaction. Returns how many messages changed."""
+    buffer = buffer or status_buffer
+    batch = buffer.take()
+    if not batch:
+        return 0
+
+    sids = list(batch)
+    updated, missing = set(), set()
+    stats = {}  # campaign id -> counter deltas
+    before = aliased(Message)
+
+    db = next(get_db())
+    try:
+        for i in range(0, len(sids), FLUSH_CHUNK_SIZE):
+            chunk = sids[i:i + FLUSH_CHUNK_SIZE]
+            incoming = values(
+                column("sid", String), column("status", String), column("rank", Integer),
+                column("error", String), column("cost", Float),
+                name="incoming"
+            ).data([(sid, batch[sid]["status"], batch[sid]["rank"], batch[sid]["error"], batch[sid]["cost"]) for sid in chunk])
+
+            changes = db.execute(
+                update(Message)
+                .where(
+                    Message.twilio_sid == incoming.c.sid,
+                    before.id == Message.id,
+                    _stored_rank() < incoming.c.rank
+                )
+                .values(
+                    status=incoming.c.status,
+                    # VALUES columns that are all NULL come back untyped, hence the casts
+                    error_message=func.coalesce(cast(incoming.c.error, String), Message.error_message),
+                    cost=func.coalesce(cast(incoming.c.cost, Float), Message.cost),
+                )
+                # 'before' is the same row joined in FROM: it still shows the pre-update values
+                .returning(Message.twilio_sid, Message.campaign_id, before.status, Message.status, before.cost, Message.cost)
+                .execution_options(synchronize_session=False)
+            ).all()
+            applied = {row[0] for row in changes}
+            updated |= applied
+
+            for _, campaign_id, old_status, new_status, old_cost, new_cost in changes:
+                deltas = stats.setdefault(campaign_id, {"delivered": 0, "total_cost": 0})
+                if new_status in DELIVERED and old_status not in DELIVERED:
+                    deltas["delivered"] += 1
+                deltas["total_cost"] += (new_cost or 0) - (old_cost or 0)
+
+            # Not updated: either stale (a higher status is already stored) or the
+            # message row isn't saved yet (sends are persisted in batches)
+            unmatched = set(chunk) - applied
+            if unmatched:
+                unmatched -= set(db.execute(select(Message.twilio_sid).where(Message.twilio_sid.in_(unmatched))).scalars())
+            missing |= unmatched
+
+        for campaign_id, deltas in stats.items():
+            bump_campaign_stats(db, campaign_id, deltas)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Status flush error: {e}")
+        missing, updated = set(batch), set()
+    finally:
+        db.close()
+
+    retry = {}
+    for sid in missing:
+        entry = batch[sid]
+        entry["attempts"] += 1
+        if entry["attempts"] <= Config.STATUS_RETRY_FLUSHES:
+            retry[sid] = entry
+    if retry:
+        buffer.requeue(retry)
+
+    if updated:
+        print(f"   📬 Applied {len(updated)} delivery status updates.")
+    return len(updated)
+
+def start_status_flusher(interval_seconds=None, buffer: StatusBuffer = None):
+    """
+    Flushes the buffer every `interval_seconds` (or as soon as it holds
+    STATUS_FLUSH_MAX callbacks) on a daemon thread. Returns the threading.Event
+    that stops it; stopping runs one last flush.
+    """
+    interval = interval_seconds or Config.STATUS_FLUSH_SECONDS
+    buffer = buffer or status_buffer
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            buffer.wakeup.wait(interval)
+            flush_status_updates(buffer)
+        flush_status_updates(buffer)
+
+    threading.Thread(target=loop, name="twilio-status-flusher", daemon=True).start()
+    return stop
@@ -0,0 +1,86 @@
+import re
+from functools import lru_cache
+
+# --- CAMPAIGN TEMPLATES ---
+# A campaign body is parsed once into literal text and field slots, then
+# rendered for every lead without re-scanning the text.
+#
+#   "Hi {name}, is {address|your home} in {zip} still for sale?"
+#
+# {field} uses the field's built-in fallback when the lead has no value,
+# {field|text} uses 'text' instead. Unknown {words} are left as typed.
+
+def _first_name(lead):
+    if not lead.owner_name:
+        return None
+    return lead.owner_name.split(" ")[0].title()
+
+def _money(amount):
+    return f"${amount:,.0f}" if amount is not None else None
+
+# field -> (value from a Lead, built-in fallback)
+TEMPLATE_FIELDS = {
+    "name":       (_first_name, "Homeowner"),
+    "full_name":  (lambda lead: lead.owner_name.title() if lead.owner_name else None, "Homeowner"),
+    "address":    (lambda lead: lead.address, "your property"),
+    "city":       (lambda lead: lead.city, "your area"),
+    "state":      (lambda lead: lead.state, ""),
+    "zip":        (lambda lead: lead.zip_code, ""),
+    "equity":     (lambda lead: _money(lead.estimated_equity), "your equity"),
+    "value":      (lambda lead: _money(lead.estimated_value), "your home's value"),
+    "beds":       (lambda lead: lead.beds, ""),
+    "baths":      (lambda lead: lead.baths, ""),
+    "sqft":       (lambda lead: f"{lead.sq_ft:,}" if lead.sq_ft else None, ""),
+    "year_built": (lambda lead: lead.year_built, ""),
+}
+
+_PLACEHOLDER = re.compile(r"\{(\w+)(?:\|([^{}]*))?\}")
+
+class CompiledTemplate:
+    """A parsed template: alternating literal strings and (field, fallback) slots."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts = []
+        self.fields = []
+        self.unknown_fields = []
+
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            field, fallback = match.group(1), match.group(2)
+            if field not in TEMPLATE_FIELDS:
+                if field not in self.unknown_fields:
+                    self.unknown_fields.append(field)
+                continue  # Stays in the surrounding literal text
+
+            self.parts.append(source[position:match.start()])
+            self.parts.append((field, TEMPLATE_FIELDS[field][1] if fallback is None else fallback))
+            if field not in self.fields:
+                self.fields.append(field)
+            position = match.end()
+        self.parts.append(source[position:])
+
+    def render(self, lead) -> str:
+        values = {}
+        for field in self.fields:
+            value = TEMPLATE_FIELDS[field][0](lead)
+            values[field] = None if value in (None, "") else str(value)
+
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                field, fallback = part
+                value = values[field]
+                out.append(fallback if value is None else value)
+        return "".join(out)
+
+    def render_many(self, leads) -> list:
+        """Renders a whole batch of leads (same order)."""
+        return [self.render(lead) for lead in leads]
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Parses a template body (cached: every batch of a campaign reuses it)."""
+    return CompiledTemplate(source or "")
@@ -0,0 +1,102 @@
+import threading
+from requests.adapters import HTTPAdapter
+from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+
+from app.core.config import Config
+
+# --- SHARED TWILIO TRANSPORT ---
+# One Twilio client per process with a sized keep-alive pool, so campaign
+# sends and manual replies reuse TCP/TLS connections instead of paying a
+# handshake per message. Created at API startup (lifespan) or on first use
+# (campaign worker, CLI).
+
+def message_options():
+    """Extra create() arguments for every outbound message (delivery status callbacks)."""
+    if Config.TWILIO_STATUS_CALLBACK_URL:
+        return {"status_callback": Config.TWILIO_STATUS_CALLBACK_URL}
+    return {}
+
+class TwilioGateway:
+    """
+    Holds the process-wide Twilio clients.
+
+    `client` is a regular (blocking) twilio Client over a pooled session.
+    `async_client` exists after `open_async()` and uses aiohttp; it must be
+    opened (and closed) inside the event loop that will use it.
+    """
+
+    def __init__(self, account_sid, auth_token, from_number=None, pool_size=None, timeout=None, api_base_url=None):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.timeout = timeout or Config.TWILIO_TIMEOUT
+        self.api_base_url = api_base_url
+
+        # No transport-level retries: re-POSTing a message could text a lead twice.
+        # 429s are handled by the SMS token bucket (SmsSender).
+        pool_size = pool_size or Config.TWILIO_POOL_SIZE
+        http_client = TwilioHttpClient(pool_connections=True, timeout=self.timeout)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        http_client.session.mount("https://", adapter)
+        http_client.session.mount("http://", adapter)
+
+        self.client = self._build_client(http_client)
+        self.async_client = None
+
+    def _build_client(self, http_client):
+        client = Client(self.account_sid, self.auth_token, http_client=http_client)
+        if self.api_base_url:
+            # Local stand-ins (benchmarks / tests) instead of api.twilio.com
+            client.api.base_url = self.api_base_url
+        return client
+
+    def send(self, to, body, **kwargs):
+        """Creates one message (blocking). Raises TwilioRestException on API errors."""
+        return self.client.messages.create(body=body, from_=self.from_number, to=to, **message_options(), **kwargs)
+
+    async def open_async(self):
+        """Opens the aiohttp-based client (call from the event loop that will use it)."""
+        if self.async_client is None:
+            from twilio.http.async_http_client import AsyncTwilioHttpClient
+            self.async_client = self._build_client(AsyncTwilioHttpClient(pool_connections=True, timeout=self.timeout))
+        return self.async_client
+
+    async def send_async(self, to, body, **kwargs):
+        """Creates one message without blocking the event loop."""
+        client = self.async_client or await self.open_async()
+        return await client.messages.create_async(body=body, from_=self.from_number, to=to, **message_options(), **kwargs)
+
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.http_client.close()
+            self.async_client = None
+
+    def close(self):
+        self.client.http_client.session.close()
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def init_gateway():
+    """Creates the process-wide gateway. Returns None if Twilio isn't configured."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None and Config.TWILIO_SID and Config.TWILIO_TOKEN:
+            try:
+                _gateway = TwilioGateway(Config.TWILIO_SID, Config.TWILIO_TOKEN, Config.TWILIO_PHONE)
+            except Exception as e:
+                print(f"[ERROR] Twilio initialization failed: {e}")
+    return _gateway
+
+def get_gateway():
+    """Returns the process-wide gateway (created on first use), or None if Twilio isn't configured."""
+    return _gateway or init_gateway()
+
+def shutdown_gateway():
+    global _gateway
+    with _gateway_lock:
+        if _gateway is not None:
+            _gateway.close()
+            _gateway = None
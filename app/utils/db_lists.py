@@ -0,0 +1,19 @@
+import ast
+import json
+
+def parse_db_list(value):
+    """
+    A list column (phones, emails) as a Python list, whatever shape it was
+    stored in: a JSON array, a JSON-encoded string, a Python-literal string
+    from older rows, or one bare value.
+    """
+    if not value: return []
+    if isinstance(value, list): return value
+    if isinstance(value, str):
+        value = value.strip()
+        try: return json.loads(value)
+        except: pass
+        try: return ast.literal_eval(value)
+        except: pass
+        return [value]
+    return []
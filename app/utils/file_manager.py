@@ -1,89 +1,307 @@
 import pandas as pd
+import numpy as np
 import json
+import csv
+import io
 import os
 import re
+from openpyxl import Workbook
+
+# --- EXPORT FORMATTING RULES ---
+# Shared by the local file export (save_leads_locally) and the streaming
+# /api/export endpoints, so both produce the same columns and values.
+
+# Internal / noisy PropertyRadar fields left out of exports
+BLACKLIST = ['Latitude', 'Longitude', 'id', 'GeocodeQuality', 'RadarID', 'PersonKey']
+
+# Columns containing one of these are shown as whole dollars ("$250,000")...
+MONEY_KEYWORDS = ['Value', 'Amount', 'Balance', 'Equity', 'Price', 'Tax', 'AVM']
+# ...unless they also contain one of these
+MONEY_IGNORE = ['Year', 'Beds', 'Baths', 'SqFt', 'Lot', 'Zip', 'isHighEquity', 'inTaxDelinquency']
+
+# Leading columns (after renaming); everything else follows alphabetically
+PRIORITY_COLUMNS = ['Owner 1 Name', 'Owner 1 Phone', 'Owner 1 Email', 'Address', 'City', 'State', 'Zip Code', 'Property Type', 'In Tax Delinquency', 'Assessed Value']
+
+# Owners flattened into their own columns, per record
+MAX_OWNERS = 2
+OWNER_FIELDS = ['Name', 'Phone', 'Email', 'Type']
+
+def is_money_column(col):
+    return any(k in col for k in MONEY_KEYWORDS) and not any(k in col for k in MONEY_IGNORE)
+
+def is_flag_column(col):
+    return col.startswith('is') or col.startswith('in')
+
+def format_money(value):
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        amount = 0
+    return f"${amount:,.0f}" if amount > 0 else "$0"
+
+def format_flag(value):
+    return "Yes" if value in [1, True, '1'] else "No"
+
+def header_name(col):
+    """'ZipFive' -> 'Zip Code', 'AvailableEquity' -> 'Available Equity'. Already-spaced names are kept."""
+    return re.sub(r'(?<!^)(?<! )(?=[A-Z])', ' ', col).title().replace("Zip Five", "Zip Code").replace("P Type", "Property Type")
+
+def owner_columns(owners=MAX_OWNERS):
+    return [f"Owner {i+1} {field}" for i in range(min(owners, MAX_OWNERS)) for field in OWNER_FIELDS]
+
+def export_columns(raw_keys, owners=0):
+    """
+    Picks and orders the export columns for records with these raw keys,
+    the most of which have `owners` Persons. Like leads_frame, owner columns
+    only go up to the owners actually present.
+    Returns [(source key, header)]; owner columns are their own source key.
+    """
+    keys = [k for k in raw_keys if k != 'Persons' and k not in BLACKLIST]
+    headers = {}
+    for key in keys:
+        headers.setdefault(header_name(key), key)
+    for col in owner_columns(owners):
+        headers.setdefault(col, col)
+
+    existing = [c for c in PRIORITY_COLUMNS if c in headers]
+    rest = sorted(c for c in headers if c not in existing)
+    return [(headers[h], h) for h in existing + rest]
+
+def format_value(col, value):
+    """One export cell: same money / Yes-No rules as the spreadsheet export."""
+    if is_money_column(col):
+        return format_money(value)
+    if is_flag_column(col):
+        return format_flag(value)
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+def flatten_lead(lead):
+    """One record with its first owners flattened into 'Owner N ...' fields."""
+    flat_lead = lead.copy()
+    persons = flat_lead.pop('Persons', [])
+
+    if isinstance(persons, list):
+        for i, person in enumerate(persons[:MAX_OWNERS]):
+            prefix = f"Owner {i+1}"
+
+            # Name
+            name = person.get('EntityName') or f"{person.get('FirstName', '')} {person.get('LastName', '')}".strip()
+            flat_lead[f"{prefix} Name"] = name
+
+            # Phones (Handle list of dicts)
+            phones = person.get('Phone', [])
+            phone_strings = []
+            if isinstance(phones, list):
+                for p in phones:
+                    if isinstance(p, dict):
+                        # Check ALL possible keys
+                        val = p.get('Value') or p.get('value') or p.get('Linktext')
+                        if val: phone_strings.append(val)
+                    elif isinstance(p, str):
+                        phone_strings.append(p)
+            flat_lead[f"{prefix} Phone"] = ", ".join(phone_strings)
+
+            # Emails
+            emails = person.get('Email', [])
+            email_strings = []
+            if isinstance(emails, list):
+                for e in emails:
+                    if isinstance(e, dict):
+                        val = e.get('Value') or e.get('value') or e.get('Email')
+                        if val: email_strings.append(val)
+                    elif isinstance(e, str):
+                        email_strings.append(e)
+            flat_lead[f"{prefix} Email"] = ", ".join(email_strings)
+            flat_lead[f"{prefix} Type"] = person.get('OwnershipRole', 'Owner')
+
+    return flat_lead
 
 def flatten_leads_with_owners(leads):
-    processed = []
-    for lead in leads:
-        flat_lead = lead.copy()
-        persons = flat_lead.pop('Persons', [])
-        
-        if isinstance(persons, list):
-            for i, person in enumerate(persons[:2]):
-                prefix = f"Owner {i+1}"
-                
-                # Name
-                name = person.get('EntityName') or f"{person.get('FirstName', '')} {person.get('LastName', '')}".strip()
-                flat_lead[f"{prefix} Name"] = name
-                
-                # Phones (Handle list of dicts)
-                phones = person.get('Phone', [])
-                phone_strings = []
-                if isinstance(phones, list):
-                    for p in phones:
-                        if isinstance(p, dict):
-                            # Check ALL possible keys
-                            val = p.get('Value') or p.get('value') or p.get('Linktext')
-                            if val: phone_strings.append(val)
-                        elif isinstance(p, str):
-                            phone_strings.append(p)
-                flat_lead[f"{prefix} Phone"] = ", ".join(phone_strings)
-
-                # Emails
-                emails = person.get('Email', [])
-                email_strings = []
-                if isinstance(emails, list):
-                    for e in emails:
-                        if isinstance(e, dict):
-                            val = e.get('Value') or e.get('value') or e.get('Email')
-                            if val: email_strings.append(val)
-                        elif isinstance(e, str):
-                            email_strings.append(e)
-                flat_lead[f"{prefix} Email"] = ", ".join(email_strings)
-                flat_lead[f"{prefix} Type"] = person.get('OwnershipRole', 'Owner')
-
-        processed.append(flat_lead)
-    return processed
-
-def save_leads_locally(leads_list, filename_prefix="Export"):
-    if not leads_list: return
-    
-    # Save JSON
-    with open(f"{filename_prefix}.json", "w") as f:
-        json.dump(leads_list, f, indent=2)
+    return [flatten_lead(lead) for lead in leads]
+
+# --- COLUMNAR (BATCH) ENGINE ---
+# Same rules as flatten_lead / format_value, applied a column at a time to a
+# whole DataFrame: no per-lead dict copies and no per-cell lambdas.
 
-    # Flatten
-    flat_data = flatten_leads_with_owners(leads_list)
-    df = pd.DataFrame(flat_data)
+PHONE_KEYS = ('Value', 'value', 'Linktext')
+EMAIL_KEYS = ('Value', 'value', 'Email')
 
-    # Cleanup & Formatting
-    blacklist = ['Latitude', 'Longitude', 'id', 'GeocodeQuality', 'RadarID', 'PersonKey']
-    df.drop(columns=[c for c in blacklist if c in df.columns], inplace=True, errors='ignore')
+def _contact_string(entries, keys):
+    """One 'Phone' / 'Email' list (dicts or plain strings) -> "a, b"."""
+    if not isinstance(entries, list):
+        return ""
+    found = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            val = entry.get(keys[0]) or entry.get(keys[1]) or entry.get(keys[2])
+            if val: found.append(val)
+        elif isinstance(entry, str):
+            found.append(entry)
+    return ", ".join(found)
+
+def _owners_frame(persons: pd.Series) -> pd.DataFrame:
+    """
+    The 'Persons' column -> 'Owner N Name/Phone/Email/Type' columns for the
+    first MAX_OWNERS owners. Builds one array per output column and scatters
+    it into place; lead dicts are never copied.
+    """
+    owner_lists = persons.tolist()
+    n_rows = len(owner_lists)
+    columns = {}
+    for n in range(MAX_OWNERS):
+        # Leads with an n-th owner, and that owner
+        rows, people = [], []
+        for row, owners in enumerate(owner_lists):
+            if isinstance(owners, list) and len(owners) > n:
+                rows.append(row)
+                people.append(owners[n])
+        if not rows:
+            break
+
+        values = {
+            'Name': [p.get('EntityName') or f"{p.get('FirstName', '')} {p.get('LastName', '')}".strip() for p in people],
+            'Phone': [_contact_string(p.get('Phone', []), PHONE_KEYS) for p in people],
+            'Email': [_contact_string(p.get('Email', []), EMAIL_KEYS) for p in people],
+            'Type': [p.get('OwnershipRole', 'Owner') for p in people],
+        }
+        for field in OWNER_FIELDS:
+            column = np.full(n_rows, np.nan, dtype=object)
+            column[rows] = values[field]
+            columns[f"Owner {n+1} {field}"] = column
+
+    return pd.DataFrame(columns, index=persons.index)
+
+def leads_frame(leads) -> pd.DataFrame:
+    """Raw records -> DataFrame with owners flattened (columnar flatten_leads_with_owners)."""
+    df = pd.DataFrame(leads)
+    if 'Persons' not in df.columns:
+        return df
+    owners = _owners_frame(df.pop('Persons'))
+    return pd.concat([df, owners], axis=1) if len(owners.columns) else df
+
+def money_series(values: pd.Series) -> pd.Series:
+    """
+    format_money for a whole column. Parsing, rounding and the > 0 test are
+    NumPy operations; the "$1,234" text is built once per distinct amount.
+    """
+    amounts = pd.to_numeric(values, errors='coerce').fillna(0).to_numpy(dtype=float)
+    # Stays float: an int64 cast would wrap amounts past ~9.2e18
+    whole = np.where(amounts > 0, np.rint(amounts), 0)
+    codes, uniques = pd.factorize(whole)
+    labels = np.array([f"${v:,.0f}" if v > 0 else "$0" for v in uniques.tolist()], dtype=object)
+    return pd.Series(labels[codes], index=values.index)
+
+def flag_series(values: pd.Series) -> pd.Series:
+    """format_flag for a whole column (1, True and '1' are Yes)."""
+    try:
+        yes = values.isin([1, '1'])
+    except TypeError:
+        # Unhashable cells (lists); fall back to the per-cell rule
+        return values.map(format_flag)
+    return pd.Series(np.where(yes, "Yes", "No"), index=values.index, dtype=object)
+
+def format_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Drops blacklisted columns, formats money / Yes-No columns, renames and orders headers."""
+    df = df.drop(columns=[c for c in BLACKLIST if c in df.columns])
 
-    money_keywords = ['Value', 'Amount', 'Balance', 'Equity', 'Price', 'Tax', 'AVM']
-    ignore = ['Year', 'Beds', 'Baths', 'SqFt', 'Lot', 'Zip', 'isHighEquity', 'inTaxDelinquency']
-    
     for col in df.columns:
-        if any(k in col for k in money_keywords) and not any(k in col for k in ignore):
+        if is_money_column(col):
             try:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                df[col] = df[col].apply(lambda x: f"${x:,.0f}" if x > 0 else "$0")
+                df[col] = money_series(df[col])
             except: pass
-        elif col.startswith('is') or col.startswith('in'):
-             df[col] = df[col].apply(lambda x: "Yes" if x in [1, True, '1'] else "No")
-
-    # Headers & Sort
-    new_headers = {c: re.sub(r'(?<!^)(?=[A-Z])', ' ', c).title().replace("Zip Five", "Zip Code").replace("P Type", "Property Type") for c in df.columns}
-    df.rename(columns=new_headers, inplace=True)
-    
-    priority = ['Owner 1 Name', 'Owner 1 Phone', 'Owner 1 Email', 'Address', 'City', 'State', 'Zip Code', 'Property Type', 'In Tax Delinquency', 'Assessed Value']
-    existing = [c for c in priority if c in df.columns]
+        elif is_flag_column(col):
+            df[col] = flag_series(df[col])
+
+    df.columns = [header_name(c) for c in df.columns]
+    existing = [c for c in PRIORITY_COLUMNS if c in df.columns]
     rest = sorted([c for c in df.columns if c not in existing])
-    df = df[existing + rest]
+    return df[existing + rest]
+
+def export_row(lead, columns):
+    """One output row (list of cells) for a raw record, in `columns` order."""
+    flat = flatten_lead(lead)
+    return [format_value(key, flat.get(key)) for key, _ in columns]
+
+# --- STREAMING WRITERS ---
+# Both take an iterator of raw records and never hold more than one row
+# (CSV) or one row plus openpyxl's temp file (XLSX) in memory.
+
+CSV_FLUSH_ROWS = 500
+
+def iter_csv(records, columns):
+    """Yields CSV text in chunks of CSV_FLUSH_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for _, header in columns])
+
+    for i, lead in enumerate(records, 1):
+        writer.writerow(export_row(lead, columns))
+        if i % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def write_xlsx(records, columns, fileobj, sheet_title="Leads"):
+    """
+    Writes an .xlsx to `fileobj` with a write-only workbook: rows go straight
+    to a temp file instead of being kept as cell objects.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append([header for _, header in columns])
+    for lead in records:
+        ws.append(export_row(lead, columns))
+    wb.save(fileobj)
+
+# Rows converted to plain Python values at a time by write_frame_xlsx
+XLSX_BLOCK_ROWS = 10000
+
+def _cell(value):
+    # pandas' own writer shows lists/dicts as their str()
+    return str(value) if isinstance(value, (list, dict)) else value
+
+def write_frame_xlsx(df: pd.DataFrame, path, sheet_title="Sheet1"):
+    """
+    Constant-memory alternative to df.to_excel: a write-only workbook that
+    streams rows to disk, converting XLSX_BLOCK_ROWS rows at a time.
+    No header styling.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append(list(df.columns))
+    for start in range(0, len(df), XLSX_BLOCK_ROWS):
+        block = df.iloc[start:start + XLSX_BLOCK_ROWS].astype(object)
+        block = block.where(block.notna(), None)
+        for row in block.itertuples(index=False, name=None):
+            ws.append([_cell(v) for v in row])
+    wb.save(path)
+
+def save_leads_locally(leads_list, filename_prefix="Export", write_only=False):
+    """
+    Saves raw records as JSON plus a formatted spreadsheet. write_only=True
+    uses the constant-memory XLSX writer (plain headers) instead of pandas.
+    """
+    if not leads_list: return
+
+    # Save JSON
+    with open(f"{filename_prefix}.json", "w") as f:
+        json.dump(leads_list, f, indent=2)
+
+    # Flatten, clean up & format (column at a time)
+    df = format_frame(leads_frame(leads_list))
 
     try:
-        df.to_excel(f"{filename_prefix}.xlsx", index=False)
+        if write_only:
+            write_frame_xlsx(df, f"{filename_prefix}.xlsx")
+        else:
+            df.to_excel(f"{filename_prefix}.xlsx", index=False)
         print(f"✅ EXCEL SAVED: {filename_prefix}.xlsx")
     except Exception as e:
         print(f"❌ Save Error: {e}")
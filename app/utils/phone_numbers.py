@@ -0,0 +1,58 @@
+import re
+
+from app.utils.db_lists import parse_db_list
+
+_NON_DIGITS = re.compile(r"\D")
+
+def normalize_phone(raw, default_country_code="1"):
+    """
+    Converts a phone number as stored or received ("(804) 555-0100",
+    "8045550100", "+1 804-555-0100") into E.164 ("+18045550100").
+    Numbers without a country code are assumed to be US/Canada.
+    Returns None if it can't be a valid number.
+    """
+    if not raw or not isinstance(raw, str):
+        return None
+
+    raw = raw.strip()
+    digits = _NON_DIGITS.sub("", raw)
+
+    if raw.startswith("+"):
+        e164 = f"+{digits}"
+    elif len(digits) == 10:
+        e164 = f"+{default_country_code}{digits}"
+    elif len(digits) == 11 and digits.startswith(default_country_code):
+        e164 = f"+{digits}"
+    else:
+        return None
+
+    # E.164: up to 15 digits after the '+'
+    return e164 if 8 <= len(e164) - 1 <= 15 else None
+
+def phone_list(value):
+    """
+    'phone_numbers' as a list of strings, in any shape parse_db_list reads
+    (JSON list, JSON string of one, Python-literal string from older rows).
+    A bare number stays as stored rather than being read as an int.
+    """
+    values = parse_db_list(value)
+    if not isinstance(values, list):
+        return [value] if isinstance(value, str) else []
+    return [v if isinstance(v, str) else str(v) for v in values if v]
+
+def normalized_phones(value):
+    """Unique E.164 numbers from a lead's 'phone_numbers' value, in order."""
+    seen = []
+    for raw in phone_list(value):
+        e164 = normalize_phone(raw)
+        if e164 and e164 not in seen:
+            seen.append(e164)
+    return seen
+
+def primary_phone(value):
+    """
+    The number we text: the first entry of a lead's 'phone_numbers'
+    (read the same way as phone_list). None if there isn't one.
+    """
+    phones = phone_list(value)
+    return phones[0] if phones else None
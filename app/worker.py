@@ -0,0 +1,37 @@
+"""
+Campaign send worker. Runs separately from the API:
+
+    python -m app.worker            # loop forever (docker-compose 'worker' service)
+    python -m app.worker --once     # drain the queue, then exit
+
+Start as many as you like, on any machine that can reach the database.
+SMS_RATE_PER_SECOND is split between them: set SMS_SENDING_PROCESSES to
+the number of workers.
+SIGTERM / Ctrl+C finishes the current batch before exiting.
+"""
+import signal
+import argparse
+import threading
+
+from app.database.database import engine, Base
+from app.database.migrations import run_migrations
+from app.domain.campaign_queue import run_worker
+
+def main():
+    parser = argparse.ArgumentParser(description="Sends queued campaign messages.")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--poll-seconds", type=float, default=None)
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    run_worker(stop, batch_size=args.batch_size, poll_seconds=args.poll_seconds, once=args.once)
+
+if __name__ == "__main__":
+    main()
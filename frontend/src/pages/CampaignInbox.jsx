@@ -7,7 +7,10 @@ const CampaignInbox = () => {
   const { id } = useParams(); 
   const navigate = useNavigate();
   const [data, setData] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedLeadId, setSelectedLeadId] = useState(null);
+  const [activeChat, setActiveChat] = useState(null);
   const [newMessage, setNewMessage] = useState("");
   const [sending, setSending] = useState(false);
   const [isPolling, setIsPolling] = useState(false);
@@ -27,15 +30,31 @@ const CampaignInbox = () => {
     return () => clearInterval(interval);
   }, [id]);
 
+  // 1b. Load (and keep refreshing) the open thread
+  useEffect(() => {
+    if (!selectedLeadId) return;
+    fetchThread(selectedLeadId);
+
+    const interval = setInterval(() => fetchThread(selectedLeadId), 5000);
+    return () => clearInterval(interval);
+  }, [id, selectedLeadId]);
+
   // 2. Scroll to bottom when switching chats or getting new messages
   useEffect(() => {
     scrollToBottom();
-  }, [selectedLeadId, data]);
+  }, [selectedLeadId, activeChat?.messages?.length]);
 
+  // Refreshes the first page. Pages loaded with "Load more" are kept below it.
   const fetchInbox = async (isBackground = false) => {
     try {
       const response = await api.getCampaignInbox(id);
-      setData(response);
+      setData(prev => {
+        if (!prev || !isBackground) return response;
+        const fresh = new Set(response.conversations.map(c => c.lead_id));
+        const older = prev.conversations.slice(response.conversations.length).filter(c => !fresh.has(c.lead_id));
+        return { ...response, conversations: [...response.conversations, ...older] };
+      });
+      if (!isBackground) setNextCursor(response.next_cursor);
       
       // Select first lead on initial load
       if (!selectedLeadId && response.conversations.length > 0) {
@@ -48,6 +67,32 @@ const CampaignInbox = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.getCampaignInbox(id, nextCursor);
+      setData(prev => {
+        const known = new Set(prev.conversations.map(c => c.lead_id));
+        return { ...prev, conversations: [...prev.conversations, ...response.conversations.filter(c => !known.has(c.lead_id))] };
+      });
+      setNextCursor(response.next_cursor);
+    } catch (error) {
+      console.error("Failed to load more conversations", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const fetchThread = async (leadId) => {
+    try {
+      const thread = await api.getCampaignThread(id, leadId);
+      setActiveChat(thread);
+    } catch (error) {
+      console.error("Failed to load conversation", error);
+    }
+  };
+
   const scrollToBottom = () => {
     chatEndRef.current?.scrollIntoView({ behavior: "smooth" });
   };
@@ -65,7 +110,7 @@ const CampaignInbox = () => {
       });
       
       setNewMessage("");
-      await fetchInbox(); // Instant refresh after sending
+      await Promise.all([fetchInbox(), fetchThread(selectedLeadId)]); // Instant refresh after sending
     } catch (error) {
       alert("Failed to send message");
     } finally {
@@ -99,8 +144,6 @@ const CampaignInbox = () => {
     </div>
   );
 
-  const activeChat = data.conversations.find(c => c.lead_id === selectedLeadId);
-
   return (
     <div className="flex h-[calc(100vh-64px)] bg-white border-t border-gray-200">
       
@@ -117,7 +160,7 @@ const CampaignInbox = () => {
           <div className="flex justify-between items-end">
             <div>
               <h2 className="font-bold text-slate-900 text-lg truncate w-64" title={data.campaign_name}>{data.campaign_name}</h2>
-              <p className="text-xs text-slate-500 mt-1">{data.conversations.length} Leads</p>
+              <p className="text-xs text-slate-500 mt-1">{data.total_leads} Leads</p>
             </div>
             {isPolling && <RefreshCw size={14} className="text-blue-400 animate-spin" title="Syncing..." />}
           </div>
@@ -145,9 +188,14 @@ const CampaignInbox = () => {
                     {conv.status}
                   </span>
                 </div>
-                <p className="text-xs text-slate-500 truncate mb-2">
+                <p className="text-xs text-slate-500 truncate mb-1">
                   {conv.address || conv.phone_number}
                 </p>
+                {conv.last_message && (
+                  <p className="text-xs text-slate-400 truncate mb-2">
+                    {conv.last_direction?.includes('outbound') ? 'You: ' : ''}{conv.last_message}
+                  </p>
+                )}
                 <div className="flex justify-between items-center text-[10px] text-slate-400">
                    <span>ID: {conv.lead_id.substring(0,8)}...</span>
                    <span>{conv.last_activity_at ? new Date(conv.last_activity_at).toLocaleDateString() : ''}</span>
@@ -155,12 +203,21 @@ const CampaignInbox = () => {
               </div>
             ))
           )}
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="w-full p-3 text-xs font-semibold text-blue-600 hover:bg-white disabled:opacity-50 transition-colors"
+            >
+              {loadingMore ? 'Loading...' : 'Load more conversations'}
+            </button>
+          )}
         </div>
       </div>
 
       {/* --- RIGHT SIDE: CHAT WINDOW --- */}
       <div className="flex-1 flex flex-col bg-white">
-        {activeChat ? (
+        {activeChat && activeChat.lead_id === selectedLeadId ? (
           <>
             {/* Chat Header */}
             <div className="px-6 py-4 border-b border-gray-100 flex justify-between items-center bg-white">
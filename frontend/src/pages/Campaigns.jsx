@@ -188,6 +188,12 @@ const CampaignCard = ({ campaign, navigate, onToggle, getStatusColor }) => (
       </div>
     </div>
     <h3 className="font-bold text-slate-900 mb-1 truncate">{campaign.name}</h3>
+    <div className="flex gap-3 text-[11px] text-slate-500 mt-2">
+      <span>{campaign.sent} sent</span>
+      <span>{campaign.delivered} delivered</span>
+      <span className="text-purple-600 font-semibold">{campaign.replied} replied</span>
+      {campaign.failed > 0 && <span className="text-red-500">{campaign.failed} failed</span>}
+    </div>
     <div className="flex justify-between text-xs text-slate-500 mt-4 pt-4 border-t border-slate-50">
       <span>{campaign.total_leads} Leads</span>
       <span>{new Date(campaign.created_at).toLocaleDateString()}</span>
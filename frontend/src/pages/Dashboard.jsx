@@ -72,8 +72,7 @@ const Dashboard = () => {
       
       const history = await api.getHistory();
       if (history && history.length > 0) {
-        const leadsData = await api.getLeads(history[0].id);
-        const freshLeads = Array.isArray(leadsData) ? leadsData : leadsData.leads || [];
+        const freshLeads = await api.getAllLeads(history[0].id);
         setEnrichedLeads(freshLeads);
 
         // Update Local State Immediately
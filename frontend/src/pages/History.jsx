@@ -4,7 +4,7 @@ import { useNavigate } from 'react-router-dom'; // Added for redirect
 import { Card } from '../components/ui/Card';
 import { Table } from '../components/ui/Table';
 import { Button } from '../components/ui/Button';
-import { FileText, Loader2, AlertCircle, Send } from 'lucide-react';
+import { FileText, Loader2, AlertCircle, Send, Download } from 'lucide-react';
 import CreateCampaignModal from '../components/campaigns/CreateCampaignModal'; // Import Modal
 
 const History = () => {
@@ -15,6 +15,9 @@ const History = () => {
   const [selectedBatchId, setSelectedBatchId] = useState(null);
   const [batchLeads, setBatchLeads] = useState([]);
   const [isLoadingLeads, setIsLoadingLeads] = useState(false);
+  const [leadsCursor, setLeadsCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const [exportingFormat, setExportingFormat] = useState(null);
 
   // --- SELECTION STATE ---
   const [selectedLeadIds, setSelectedLeadIds] = useState(new Set());
@@ -42,11 +45,13 @@ const History = () => {
     setSelectedBatchId(batchId);
     setIsLoadingLeads(true);
     setBatchLeads([]); 
+    setLeadsCursor(null);
     setSelectedLeadIds(new Set()); // Reset selection when switching batches
 
     try {
-      const data = await api.getLeads(batchId);
-      setBatchLeads(Array.isArray(data) ? data : data.leads || []); 
+      const { leads, nextCursor } = await api.getLeads(batchId);
+      setBatchLeads(leads);
+      setLeadsCursor(nextCursor);
     } catch (err) {
       console.error("Failed to load leads:", err);
     } finally {
@@ -54,6 +59,31 @@ const History = () => {
     }
   };
 
+  const loadMoreLeads = async () => {
+    if (!leadsCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const { leads, nextCursor } = await api.getLeads(selectedBatchId, leadsCursor);
+      setBatchLeads(prev => [...prev, ...leads]);
+      setLeadsCursor(nextCursor);
+    } catch (err) {
+      console.error("Failed to load more leads:", err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  const handleExport = async (format) => {
+    setExportingFormat(format);
+    try {
+      await api.exportSearch(selectedBatchId, format);
+    } catch (err) {
+      console.error("Failed to export leads:", err);
+    } finally {
+      setExportingFormat(null);
+    }
+  };
+
   // --- SELECTION LOGIC ---
   const toggleSelectAll = () => {
     if (selectedLeadIds.size === batchLeads.length) {
@@ -165,13 +195,19 @@ const History = () => {
                 
                 {/* ACTION AREA */}
                 <div className="flex items-center gap-3">
+                  {['csv', 'xlsx'].map(format => (
+                    <Button key={format} onClick={() => handleExport(format)} disabled={exportingFormat !== null} className="bg-white text-slate-700 border border-slate-200 hover:bg-slate-50">
+                      {exportingFormat === format ? <Loader2 size={16} className="animate-spin mr-2" /> : <Download size={16} className="mr-2" />}
+                      {format === 'csv' ? 'CSV' : 'Excel'}
+                    </Button>
+                  ))}
                   {selectedLeadIds.size > 0 ? (
                      <Button onClick={() => setIsModalOpen(true)} className="bg-blue-600 text-white hover:bg-blue-700 animate-in fade-in zoom-in">
                        <Send size={16} className="mr-2" /> Start Campaign ({selectedLeadIds.size})
                      </Button>
                   ) : (
                     <div className="text-sm text-slate-500">
-                       Showing <span className="font-bold text-slate-900">{batchLeads.length}</span> records
+                       Showing <span className="font-bold text-slate-900">{batchLeads.length}</span>{leadsCursor ? '+' : ''} records
                     </div>
                   )}
                 </div>
@@ -243,6 +279,13 @@ const History = () => {
                         ))}
                       </Table>
                     </div>
+                    {leadsCursor && (
+                      <div className="flex justify-center mt-4">
+                        <Button onClick={loadMoreLeads} disabled={isLoadingMore} className="bg-white text-slate-700 border border-slate-200 hover:bg-slate-50">
+                          {isLoadingMore ? <Loader2 size={16} className="animate-spin mr-2" /> : null} Load more records
+                        </Button>
+                      </div>
+                    )}
                   </div>
                 )}
               </div>
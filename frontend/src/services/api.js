@@ -72,9 +72,35 @@ export const api = {
     return response.data;
   },
 
-  getLeads: async (searchId) => {
-    const response = await client.get(`/history/${searchId}`);
-    return response.data;
+  // One page of a search's leads; nextCursor is null on the last page
+  getLeads: async (searchId, cursor = null, limit = 500) => {
+    const params = { limit };
+    if (cursor) params.cursor = cursor;
+    const response = await client.get(`/history/${searchId}`, { params });
+    return { leads: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  },
+
+  // Every lead of a search, following the page cursors
+  getAllLeads: async (searchId) => {
+    let all = [];
+    let cursor = null;
+    do {
+      const { leads, nextCursor } = await api.getLeads(searchId, cursor);
+      all = all.concat(leads);
+      cursor = nextCursor;
+    } while (cursor);
+    return all;
+  },
+
+  // Downloads a search as 'csv' or 'xlsx' (streamed by the server)
+  exportSearch: async (searchId, format = 'csv') => {
+    const response = await client.get(`/export/search/${searchId}`, { params: { format }, responseType: 'blob' });
+    const url = URL.createObjectURL(response.data);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `search_${searchId}.${format}`;
+    link.click();
+    URL.revokeObjectURL(url);
   },
 
   // --- CAMPAIGN & MESSAGING ENDPOINTS ---
@@ -92,9 +118,24 @@ export const api = {
     return response.data;
   },
 
-  // 3. Get the Inbox (Chat History)
-  getCampaignInbox: async (campaignId) => {
-    const response = await client.get(`/campaigns/${campaignId}/inbox`);
+  // 2b. Preview a template against a few leads (nothing is sent)
+  previewCampaign: async (payload) => {
+    // payload = { template_body, lead_ids, sample_size }
+    const response = await client.post('/campaigns/preview', payload);
+    return response.data;
+  },
+
+  // 3. Get one page of the Inbox (conversation summaries, newest activity first)
+  getCampaignInbox: async (campaignId, cursor = null, limit = 50) => {
+    const params = { limit };
+    if (cursor) params.cursor = cursor;
+    const response = await client.get(`/campaigns/${campaignId}/inbox`, { params });
+    return response.data;
+  },
+
+  // 3b. Get the full chat history with one lead
+  getCampaignThread: async (campaignId, leadId) => {
+    const response = await client.get(`/campaigns/${campaignId}/inbox/${leadId}`);
     return response.data;
   },
 
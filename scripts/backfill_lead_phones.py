@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.database.database import engine, Base, SessionLocal
+from app.database.repository import backfill_lead_phones
+
+def run_backfill():
+    """Fills 'lead_phones' for leads saved before the phone index existed."""
+    print("⏳ Backfilling normalized phone index...")
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        total = backfill_lead_phones(db)
+        print(f"✅ Done. {total} leads indexed.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_backfill()
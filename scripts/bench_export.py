@@ -0,0 +1,191 @@
+"""
+Export formatting benchmark: per-lead flatten + per-cell apply (old
+save_leads_locally) vs the columnar engine in file_manager (leads_frame +
+format_frame), on synthetic PropertyRadar records.
+
+Also times the spreadsheet write both ways (pandas to_excel vs the
+write-only writer) and reports how much each grows peak RSS (Linux).
+Checks that both paths produce identical values before timing.
+
+    python scripts/bench_export.py --records 100000
+    python scripts/bench_export.py --records 100000 --skip-xlsx
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+import resource
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "bench-token")
+
+import pandas as pd
+from app.utils.file_manager import leads_frame, format_frame, write_frame_xlsx
+
+FIRST = ["JOHN", "MARY", "ROBERT", "LINDA", "JAMES", "PATRICIA", "DAVID", "SUSAN"]
+LAST = ["SMITH", "JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA", "MILLER"]
+CITIES = ["RICHMOND", "NORFOLK", "ROANOKE", "ARLINGTON", "ALEXANDRIA"]
+
+def person(rng):
+    phones = [{"Value": f"804555{rng.randrange(10000):04d}", "Linktext": "call"} for _ in range(rng.randrange(4))]
+    if rng.random() < 0.1:
+        phones.append(f"757555{rng.randrange(10000):04d}")  # plain strings happen too
+    emails = [{"value": f"owner{rng.randrange(10**6)}@example.com"} for _ in range(rng.randrange(3))]
+    if rng.random() < 0.15:
+        return {"EntityName": f"{rng.choice(LAST)} HOLDINGS LLC", "Phone": phones, "Email": emails, "OwnershipRole": "Company"}
+    return {"FirstName": rng.choice(FIRST), "LastName": rng.choice(LAST), "Phone": phones, "Email": emails}
+
+def record(i, rng):
+    avm = rng.randrange(50_000, 1_500_000)
+    return {
+        "RadarID": f"P{i:08d}", "PersonKey": f"K{i}", "id": i,
+        "Address": f"{rng.randrange(1, 9999)} MAIN ST", "City": rng.choice(CITIES), "State": "VA",
+        "ZipFive": f"23{rng.randrange(1000):03d}", "County": "HENRICO", "APN": f"{rng.randrange(10**9)}",
+        "PType": rng.choice(["SFR", "CND", "MFR"]),
+        "Beds": rng.randrange(1, 6), "Baths": rng.choice([1, 1.5, 2, 2.5, 3]), "SqFt": rng.randrange(600, 5000),
+        "LotSize": rng.randrange(1000, 40000), "YearBuilt": rng.randrange(1900, 2024),
+        "AVM": avm, "AvailableEquity": str(avm * rng.random()) if rng.random() < 0.5 else avm // 3,
+        "AssessedValue": rng.choice([avm * 0.8, None, "N/A"]), "TotalLoanBalance": rng.randrange(0, avm),
+        "LastTransferValue": rng.randrange(0, avm), "EquityPercent": rng.randrange(0, 100),
+        "isHighEquity": rng.choice([0, 1, True, False, "1", None]), "inTaxDelinquency": rng.choice([0, 1, "1"]),
+        "inForeclosure": rng.choice([0, 1]), "isListedForSale": rng.choice([0, 1, None]),
+        "Latitude": 37.5 + rng.random(), "Longitude": -77.4 - rng.random(), "GeocodeQuality": "high",
+        "Persons": [person(rng) for _ in range(rng.choice([0, 1, 1, 2, 2, 3]))],
+    }
+
+# --- OLD PATH (copied from save_leads_locally before the columnar engine) ---
+
+def old_flatten(leads):
+    processed = []
+    for lead in leads:
+        flat_lead = lead.copy()
+        persons = flat_lead.pop('Persons', [])
+        if isinstance(persons, list):
+            for i, person in enumerate(persons[:2]):
+                prefix = f"Owner {i+1}"
+                name = person.get('EntityName') or f"{person.get('FirstName', '')} {person.get('LastName', '')}".strip()
+                flat_lead[f"{prefix} Name"] = name
+                phones = person.get('Phone', [])
+                phone_strings = []
+                if isinstance(phones, list):
+                    for p in phones:
+                        if isinstance(p, dict):
+                            val = p.get('Value') or p.get('value') or p.get('Linktext')
+                            if val: phone_strings.append(val)
+                        elif isinstance(p, str):
+                            phone_strings.append(p)
+                flat_lead[f"{prefix} Phone"] = ", ".join(phone_strings)
+                emails = person.get('Email', [])
+                email_strings = []
+                if isinstance(emails, list):
+                    for e in emails:
+                        if isinstance(e, dict):
+                            val = e.get('Value') or e.get('value') or e.get('Email')
+                            if val: email_strings.append(val)
+                        elif isinstance(e, str):
+                            email_strings.append(e)
+                flat_lead[f"{prefix} Email"] = ", ".join(email_strings)
+                flat_lead[f"{prefix} Type"] = person.get('OwnershipRole', 'Owner')
+        processed.append(flat_lead)
+    return processed
+
+def old_format(leads):
+    df = pd.DataFrame(old_flatten(leads))
+    blacklist = ['Latitude', 'Longitude', 'id', 'GeocodeQuality', 'RadarID', 'PersonKey']
+    df.drop(columns=[c for c in blacklist if c in df.columns], inplace=True, errors='ignore')
+    money_keywords = ['Value', 'Amount', 'Balance', 'Equity', 'Price', 'Tax', 'AVM']
+    ignore = ['Year', 'Beds', 'Baths', 'SqFt', 'Lot', 'Zip', 'isHighEquity', 'inTaxDelinquency']
+    for col in df.columns:
+        if any(k in col for k in money_keywords) and not any(k in col for k in ignore):
+            try:
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                df[col] = df[col].apply(lambda x: f"${x:,.0f}" if x > 0 else "$0")
+            except: pass
+        elif col.startswith('is') or col.startswith('in'):
+            df[col] = df[col].apply(lambda x: "Yes" if x in [1, True, '1'] else "No")
+    new_headers = {c: re.sub(r'(?<!^)(?<! )(?=[A-Z])', ' ', c).title().replace("Zip Five", "Zip Code").replace("P Type", "Property Type") for c in df.columns}
+    df.rename(columns=new_headers, inplace=True)
+    priority = ['Owner 1 Name', 'Owner 1 Phone', 'Owner 1 Email', 'Address', 'City', 'State', 'Zip Code', 'Property Type', 'In Tax Delinquency', 'Assessed Value']
+    existing = [c for c in priority if c in df.columns]
+    rest = sorted([c for c in df.columns if c not in existing])
+    return df[existing + rest]
+
+def new_format(leads):
+    return format_frame(leads_frame(leads))
+
+def timed(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def current_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def rss_growth(fn):
+    """
+    Runs fn in a forked child and returns (seconds, MB the child's peak RSS
+    grew by). Forking keeps each writer's peak separate. Linux only.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        start_mb = current_rss_mb()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        os.write(write_fd, f"{elapsed} {peak_mb - start_mb}".encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        elapsed, grown = pipe.read().split()
+    os.waitpid(pid, 0)
+    return float(elapsed), float(grown)
+
+def same_values(a, b):
+    if list(a.columns) != list(b.columns):
+        return False
+    normalize = lambda df: df.astype(object).where(df.notna(), "").astype(str)
+    return normalize(a).equals(normalize(b))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-xlsx", action="store_true", help="Only time flatten + formatting")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    leads = [record(i, rng) for i in range(args.records)]
+    print(f"{args.records:,} synthetic records")
+
+    old_seconds, old_df = timed(lambda: old_format(leads), args.repeat)
+    new_seconds, new_df = timed(lambda: new_format(leads), args.repeat)
+
+    print(f"   Identical output: {same_values(old_df, new_df)} ({new_df.shape[1]} columns)")
+    print(f"   Flatten + format, per-cell apply: {old_seconds:8.2f} s")
+    print(f"   Flatten + format, columnar:       {new_seconds:8.2f} s   ({old_seconds / new_seconds:.1f}x)")
+
+    if args.skip_xlsx:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pandas_s, pandas_mb = rss_growth(lambda: new_df.to_excel(os.path.join(tmp, "pandas.xlsx"), index=False))
+        stream_s, stream_mb = rss_growth(lambda: write_frame_xlsx(new_df, os.path.join(tmp, "stream.xlsx")))
+    print(f"   XLSX, pandas to_excel:   {pandas_s:8.2f} s   +{pandas_mb:7.1f} MB peak RSS")
+    print(f"   XLSX, write-only writer: {stream_s:8.2f} s   +{stream_mb:7.1f} MB peak RSS")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Ingest throughput benchmark: per-lead save_lead vs save_leads_bulk (leads/second).
+
+Writes synthetic PropertyRadar records into a SCRATCH Postgres database.
+Both paths upsert the same records: a first pass inserts them and a
+second pass updates them, like re-enriching leads you already own.
+
+    python scripts/bench_ingest.py --db-url postgresql://user:pw@localhost:5435/bench_db --leads 5000
+
+Never point --db-url at the production database.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "bench-token")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.models import SearchHistory
+from app.database.migrations import run_migrations
+from app.database.repository import save_lead, save_leads_bulk
+
+def synthetic_record(i, prefix):
+    return {
+        "RadarID": f"{prefix}{i:07d}",
+        "Address": f"{i} Main St", "City": "RICHMOND", "State": "VA", "ZipFive": "23220",
+        "Beds": 3, "Baths": 2.0, "SqFt": 1450, "YearBuilt": 1962,
+        "AVM": 250000 + i, "AvailableEquity": 120000,
+        "Persons": [{
+            "FirstName": "Jane", "LastName": "Doe", "PersonKey": f"K{i}",
+            "Phone": [{"Value": f"+1804555{i % 10000:04d}"}],
+            "Email": [{"Value": f"owner{i}@example.com"}],
+        }],
+    }
+
+def run(label, db, records, search_id, save):
+    for phase in ("insert", "update"):
+        start = time.perf_counter()
+        save(db, records, search_id)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<22} {phase:<7} {len(records) / elapsed:>10,.0f} leads/s   ({elapsed:.2f}s)")
+
+def per_lead(db, records, search_id):
+    for data in records:
+        save_lead(db, data, search_id)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--leads", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = sessionmaker(bind=engine)()
+
+    search = SearchHistory(state="VA", city="RICHMOND", strategy="bench")
+    db.add(search)
+    db.commit()
+
+    print(f"📊 {args.leads} synthetic leads per path\n")
+    run("save_lead (per lead)", db, [synthetic_record(i, "BENCH-A-") for i in range(args.leads)], search.id, per_lead)
+    run("save_leads_bulk", db, [synthetic_record(i, "BENCH-B-") for i in range(args.leads)], search.id,
+        lambda db, records, sid: save_leads_bulk(db, records, sid, chunk_size=args.chunk_size))
+
+    # Leave the scratch database as we found it
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM search_results WHERE search_id = :sid"), {"sid": search.id})
+        conn.execute(text("DELETE FROM lead_phones WHERE lead_id LIKE 'BENCH-%'"))
+        conn.execute(text("DELETE FROM leads WHERE radar_id LIKE 'BENCH-%'"))
+        conn.execute(text("DELETE FROM search_history WHERE id = :sid"), {"sid": search.id})
+    db.close()
+
+if __name__ == "__main__":
+    main()
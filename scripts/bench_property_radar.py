@@ -0,0 +1,92 @@
+"""
+Latency benchmark: bare requests.get() vs the pooled PropertyRadarClient session.
+
+Spins up a local stand-in for api.propertyradar.com and times N property
+lookups each way. Use --handshake-ms to simulate the TCP+TLS setup cost a
+fresh connection pays against the real API (charged once per new connection).
+
+    python scripts/bench_property_radar.py --calls 500 --handshake-ms 30
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "bench-token")
+
+import requests
+from app.services.property_radar import PropertyRadarClient, build_session
+from app.services.rate_limiter import TokenBucket
+
+HANDSHAKE_SECONDS = 0.0
+PAYLOAD = json.dumps({"results": [{"RadarID": "P1234", "Address": "1 Main St", "Beds": 3}]}).encode()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # Runs once per accepted connection
+        if HANDSHAKE_SECONDS:
+            time.sleep(HANDSHAKE_SECONDS)
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+def timed(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms   p95 {p95:7.2f} ms")
+
+def main():
+    global HANDSHAKE_SECONDS
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    HANDSHAKE_SECONDS = args.handshake_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    url = f"{base_url}/properties/P1234"
+
+    print(f"📊 {args.calls} calls per mode, simulated handshake {args.handshake_ms} ms\n")
+
+    # BEFORE: a new connection per call (what bare requests.get does)
+    before = timed(lambda: requests.get(url, params={"Purchase": "1", "Fields": "Overview"}).json(), args.calls)
+    report("before (requests.get)", before)
+
+    # AFTER: the client on a pooled keep-alive session
+    client = PropertyRadarClient(base_url=base_url, session=build_session())
+    client.limiter = TokenBucket(rate=1e6)  # measure the transport, not the API rate limit
+    after = timed(lambda: client.get_property_data("P1234"), args.calls)
+    report("after (pooled session)", after)
+
+    saved = statistics.mean(before) - statistics.mean(after)
+    print(f"\n✅ Per-call overhead saved: {saved:.2f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
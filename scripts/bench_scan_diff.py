@@ -0,0 +1,93 @@
+"""
+Scan diff benchmark: full-table ID set (old) vs chunked IN lookups (new).
+
+Seeds the `leads` table of a SCRATCH Postgres database to each size (rows
+prefixed BENCHSCAN-, removed again at the end) and classifies the same
+scanned list against it. The new path should stay flat as the table grows;
+the old one grows with it.
+
+    python scripts/bench_scan_diff.py --db-url postgresql://user:pw@localhost:5435/bench_db
+    python scripts/bench_scan_diff.py --db-url ... --sizes 10000 100000 1000000 --scanned 2000
+
+Never point --db-url at the production database.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "bench-token")
+
+from sqlalchemy import create_engine, insert, text, func
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.models import Lead
+from app.domain.harvest import classify_list_items
+
+PREFIX = "BENCHSCAN-"
+
+def seed(db, target, batch=20000):
+    """Tops the bench rows up to `target` (IDs BENCHSCAN-L0000000...)."""
+    current = db.query(func.count(Lead.radar_id)).filter(Lead.radar_id.like(f"{PREFIX}%")).scalar()
+    for start in range(current, target, batch):
+        rows = [
+            {"radar_id": f"{PREFIX}L{i:07d}", "address": f"{i} Main St", "city": "RICHMOND", "state": "VA",
+             "owner_name": "Jane Doe", "phone_numbers": ["+18045550100"], "email_addresses": []}
+            for i in range(start, min(start + batch, target))
+        ]
+        db.execute(insert(Lead), rows)
+        db.commit()
+
+def scanned_items(table_size, scanned):
+    """Half the scanned IDs are already owned, half are brand new."""
+    owned = [{"RadarID": f"{PREFIX}L{i:07d}"} for i in range(0, table_size, max(1, table_size // (scanned // 2)))][:scanned // 2]
+    new = [{"RadarID": f"{PREFIX}N{i:07d}", "Address": "1 New St"} for i in range(scanned - len(owned))]
+    return owned + new
+
+def old_diff(db, items):
+    existing_ids = {id[0] for id in db.query(Lead.radar_id).all()}
+    owned = [i["RadarID"] for i in items if i["RadarID"] in existing_ids]
+    db.query(Lead).filter(Lead.radar_id.in_(owned)).all()
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def cleanup(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM lead_phones WHERE lead_id LIKE :p"), {"p": f"{PREFIX}%"})
+        conn.execute(text("DELETE FROM leads WHERE radar_id LIKE :p"), {"p": f"{PREFIX}%"})
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scanned", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    Base.metadata.create_all(bind=engine)
+    cleanup(engine)
+    db = sessionmaker(bind=engine)()
+
+    print(f"📊 Scanned list: {args.scanned} IDs (half owned)\n")
+    print(f"{'leads rows':>12} {'old (full set)':>16} {'new (chunked IN)':>18}")
+    for size in sorted(args.sizes):
+        seed(db, size)
+        items = scanned_items(size, args.scanned)
+        old_ms = timed(lambda: old_diff(db, items))
+        new_ms = timed(lambda: classify_list_items(db, iter(items)))
+        print(f"{size:>12,} {old_ms:>13.1f} ms {new_ms:>15.1f} ms")
+
+    # Leave the scratch database as we found it
+    db.close()
+    cleanup(engine)
+
+if __name__ == "__main__":
+    main()
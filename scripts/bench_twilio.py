@@ -0,0 +1,119 @@
+"""
+Latency benchmark: one-off SMS send with a new twilio Client per call (the
+old send_one_off_message) vs the shared TwilioGateway (sync and async).
+
+Spins up a local stand-in for api.twilio.com's Messages endpoint and times N
+sends each way. Use --handshake-ms to simulate the TCP+TLS setup cost a
+fresh connection pays against the real API (charged once per new connection).
+
+    python scripts/bench_twilio.py --calls 300 --handshake-ms 30
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "bench-token")
+
+from twilio.rest import Client
+from app.services.twilio_gateway import TwilioGateway
+
+ACCOUNT_SID = "AC" + "0" * 32
+HANDSHAKE_SECONDS = 0.0
+PAYLOAD = json.dumps({
+    "sid": "SM" + "1" * 32, "account_sid": ACCOUNT_SID, "status": "queued",
+    "to": "+18045550100", "from": "+18045550199", "body": "Hi", "price": None,
+}).encode()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # Runs once per accepted connection
+        if HANDSHAKE_SECONDS:
+            time.sleep(HANDSHAKE_SECONDS)
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+def timed(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+async def timed_async(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms   p95 {p95:7.2f} ms")
+
+def main():
+    global HANDSHAKE_SECONDS
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    HANDSHAKE_SECONDS = args.handshake_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"📊 {args.calls} sends per mode, simulated handshake {args.handshake_ms} ms\n")
+
+    # BEFORE: a new Client (and connection) per send
+    def fresh_client_send():
+        client = Client(ACCOUNT_SID, "bench-token")
+        client.api.base_url = base_url
+        client.messages.create(body="Hi", from_="+18045550199", to="+18045550100")
+    before = timed(fresh_client_send, args.calls)
+    report("before (Client per send)", before)
+
+    # AFTER: the shared gateway on a pooled keep-alive session
+    gateway = TwilioGateway(ACCOUNT_SID, "bench-token", "+18045550199", api_base_url=base_url)
+    after = timed(lambda: gateway.send("+18045550100", "Hi"), args.calls)
+    report("after (gateway, sync)", after)
+
+    # AFTER: the gateway's optional aiohttp transport
+    async def run_async():
+        await gateway.open_async()
+        try:
+            return await timed_async(lambda: gateway.send_async("+18045550100", "Hi"), args.calls)
+        finally:
+            await gateway.aclose()
+    after_async = asyncio.run(run_async())
+    report("after (gateway, async)", after_async)
+
+    saved = statistics.mean(before) - statistics.mean(after)
+    print(f"\n✅ Per-send overhead saved: {saved:.2f} ms")
+    gateway.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
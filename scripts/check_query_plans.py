@@ -0,0 +1,131 @@
+"""
+Query plan regression check for the hot inbox / launch / inbound / history queries.
+
+Seeds a SCRATCH Postgres database, then EXPLAINs each query with sequential
+scans disabled. Postgres still falls back to a Seq Scan when no index can
+serve the query, so any Seq Scan on a hot table means an index is missing.
+Exits non-zero on failure (usable in CI).
+
+    python scripts/check_query_plans.py --db-url postgresql://user:pw@localhost:5435/plan_check_db
+
+Never point --db-url at the production database.
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PROPERTY_RADAR_API_TOKEN", "plan-check-token")
+
+from sqlalchemy import create_engine, insert, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.migrations import run_migrations
+from app.database.models import User, Lead, LeadPhone, SearchHistory, SearchResult, Campaign, CampaignLead, Message
+
+HOT_TABLES = {"messages", "campaign_leads", "search_results", "lead_phones"}
+
+def seed(db, leads=2000, campaigns=20, messages_per_lead=5):
+    if db.query(Campaign).count():
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(insert(User), [{"email": "plans@example.com", "hashed_password": "x"}])
+    user_id = db.query(User.id).scalar()
+
+    db.execute(insert(Lead), [{"radar_id": f"L{i:05d}", "phone_numbers": [f"+1804555{i:04d}"]} for i in range(leads)])
+    db.execute(insert(LeadPhone), [{"lead_id": f"L{i:05d}", "phone": f"+1804555{i:04d}"} for i in range(leads)])
+
+    db.execute(insert(SearchHistory), [{"state": "VA", "city": "RICHMOND", "strategy": "plan", "user_id": user_id} for _ in range(campaigns)])
+    search_ids = [row[0] for row in db.query(SearchHistory.id)]
+    db.execute(insert(SearchResult), [{"search_id": search_ids[i % campaigns], "lead_id": f"L{i:05d}"} for i in range(leads)])
+
+    db.execute(insert(Campaign), [{"user_id": user_id, "name": f"C{c}", "template_body": "Hi {name}"} for c in range(campaigns)])
+    campaign_ids = [row[0] for row in db.query(Campaign.id)]
+    db.execute(insert(CampaignLead), [
+        {"campaign_id": campaign_ids[i % campaigns], "lead_id": f"L{i:05d}", "status": ("queued", "sent", "replied")[i % 3]}
+        for i in range(leads)
+    ])
+    db.execute(insert(Message), [
+        {"campaign_id": campaign_ids[i % campaigns], "lead_id": f"L{i:05d}",
+         "direction": "outbound-api" if m % 2 == 0 else "inbound", "body": "hello", "status": "delivered",
+         "created_at": now - timedelta(minutes=m)}
+        for i in range(leads) for m in range(messages_per_lead)
+    ])
+    db.commit()
+
+def hot_queries(db):
+    """Same query shapes the app runs (routes/campaigns.py, campaign_queue.py, message_service.py, routes/history.py)."""
+    campaign_id = db.query(Campaign.id).order_by(Campaign.id).first()[0]
+    search_id = db.query(SearchHistory.id).order_by(SearchHistory.id).first()[0]
+    lead_ids = ["L00001", "L00002"]
+    return {
+        "inbox: roster": db.query(CampaignLead).filter(CampaignLead.campaign_id == campaign_id),
+        "inbox: contact list page": db.query(CampaignLead.id, CampaignLead.lead_id).filter(
+            CampaignLead.campaign_id == campaign_id,
+            tuple_(CampaignLead.last_activity_at, CampaignLead.id) < tuple_(datetime.now(timezone.utc), 10**9)
+        ).order_by(CampaignLead.last_activity_at.desc(), CampaignLead.id.desc()).limit(51),
+        "inbox: last message": db.query(Message.body, Message.direction).filter(
+            Message.campaign_id == campaign_id, Message.lead_id == "L00001"
+        ).order_by(Message.created_at.desc(), Message.id.desc()).limit(1),
+        "inbox: messages": db.query(Message).filter(Message.campaign_id == campaign_id).order_by(Message.created_at.asc()),
+        "inbox: thread": db.query(Message).filter(
+            Message.campaign_id == campaign_id, Message.lead_id == "L00001").order_by(Message.created_at.asc()),
+        "launch: queued leads": db.query(CampaignLead).filter(
+            CampaignLead.campaign_id == campaign_id, CampaignLead.status == "queued"),
+        "worker: claim queued": db.query(CampaignLead.id).filter(
+            CampaignLead.status == "queued").order_by(CampaignLead.id).limit(50),
+        "inbound: phone lookup": db.query(Lead).join(LeadPhone, LeadPhone.lead_id == Lead.radar_id).filter(
+            LeadPhone.phone == "+18045550001"),
+        "inbound: last outbound": db.query(Message).filter(
+            Message.lead_id.in_(lead_ids), Message.direction.like("outbound%")
+        ).order_by(Message.created_at.desc()).limit(1),
+        "inbound: last roster entry": db.query(CampaignLead).filter(
+            CampaignLead.lead_id.in_(lead_ids)).order_by(CampaignLead.created_at.desc()).limit(1),
+        "inbound: roster status": db.query(CampaignLead).filter(
+            CampaignLead.campaign_id == campaign_id, CampaignLead.lead_id == "L00001"),
+        "history: search leads": db.query(SearchResult).filter(SearchResult.search_id == search_id),
+        "history: leads page": db.query(SearchResult.id, Lead.radar_id).join(Lead, Lead.radar_id == SearchResult.lead_id).filter(
+            SearchResult.search_id == search_id, SearchResult.id > 0).order_by(SearchResult.id).limit(500),
+    }
+
+def seq_scans(plan):
+    """Yields the relation name of every Seq Scan node in an EXPLAIN (FORMAT JSON) plan."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", required=True)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+    db.execute(text("ANALYZE"))
+    db.execute(text("SET enable_seqscan = off"))
+
+    failures = 0
+    for name, query in hot_queries(db).items():
+        sql = query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+        bad = sorted({rel for rel in seq_scans(plan) if rel in HOT_TABLES})
+        if bad:
+            failures += 1
+            print(f"❌ FAIL: {name} -> Seq Scan on {', '.join(bad)}")
+        else:
+            print(f"✅ PASS: {name}")
+
+    db.close()
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
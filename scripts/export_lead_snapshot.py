@@ -0,0 +1,48 @@
+"""
+Writes the leads table to the partitioned Parquet snapshot analysts read
+(state=<ST>/city=<CITY>/...). Incremental: only leads changed since the
+last run are appended. Schedule it (cron) as often as analysts need.
+
+    python scripts/export_lead_snapshot.py
+    python scripts/export_lead_snapshot.py --dir /data/snapshots/leads --full
+    python scripts/export_lead_snapshot.py --db-url postgresql://user:pw@replica:5432/property_db
+
+Reading it back (no Postgres involved):
+
+    from app.services.lead_snapshot import read_lead_snapshot
+    df = read_lead_snapshot("/data/snapshots/leads").to_pandas()
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Config
+from app.database.database import SessionLocal
+from app.services.lead_snapshot import export_lead_snapshot
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=Config.SNAPSHOT_DIR, help="Snapshot root directory")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and export every lead")
+    parser.add_argument("--db-url", help="Read from this database (e.g. a replica) instead of the app database")
+    args = parser.parse_args()
+
+    session_factory = sessionmaker(bind=create_engine(args.db_url)) if args.db_url else SessionLocal
+    db = session_factory()
+    print(f"⏳ Exporting lead snapshot to {args.dir}{' (full)' if args.full else ''}...")
+    try:
+        written = export_lead_snapshot(db, args.dir, full=args.full)
+        print(f"✅ Done. {written} leads appended.")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
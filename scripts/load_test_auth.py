@@ -0,0 +1,122 @@
+"""
+Login storm load test: latency of ordinary authenticated routes
+(/api/campaigns/, /api/history/) on their own, then while many clients
+hammer /api/auth/login at the same time.
+
+Run it against a server started the usual way (one uvicorn worker shows
+the contention best), pointed at a scratch database; the test user is
+created through /api/auth/signup:
+
+    uvicorn app.main:app --port 9999
+    python scripts/load_test_auth.py --base-url http://127.0.0.1:9999 --logins 200 --seconds 15
+
+With the password hashing pool, logins past its queue depth come back as
+503 right away and the other routes' p99 should stay close to baseline.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+EMAIL = "login-storm@example.com"
+PASSWORD = "storm-password-123"
+ROUTES = ["/api/campaigns/", "/api/history/"]
+
+def percentile(samples, q):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+def report(label, samples):
+    if not samples:
+        print(f"   {label:28s} no samples")
+        return
+    print(f"   {label:28s} n={len(samples):6d}   p50 {percentile(samples, 0.50):8.1f} ms   "
+          f"p99 {percentile(samples, 0.99):8.1f} ms   max {max(samples):8.1f} ms")
+
+async def get_token(client):
+    await client.post("/api/auth/signup", json={"email": EMAIL, "password": PASSWORD, "full_name": "Login Storm"})
+    r = await client.post("/api/auth/login", data={"username": EMAIL, "password": PASSWORD})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+async def route_sampler(client, token, stop, samples, errors):
+    """One client calling the regular routes back to back."""
+    headers = {"Authorization": f"Bearer {token}"}
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            r = await client.get(ROUTES[i % len(ROUTES)], headers=headers)
+            if r.status_code != 200:
+                errors[r.status_code] = errors.get(r.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        samples.append((time.perf_counter() - start) * 1000)
+        i += 1
+
+async def login_client(client, stop, statuses, latencies):
+    """One client logging in back to back, waiting out Retry-After on a 503."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            r = await client.post("/api/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            code, retry_after = r.status_code, float(r.headers.get("Retry-After", 0))
+        except httpx.HTTPError as e:
+            code, retry_after = type(e).__name__, 0
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[code] = statuses.get(code, 0) + 1
+        if retry_after:
+            await asyncio.sleep(retry_after)
+
+async def phase(base_url, token, samplers, logins, seconds):
+    limits = httpx.Limits(max_connections=samplers + logins + 10, max_keepalive_connections=samplers + logins + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.perf_counter()
+        stop = asyncio.Event()
+        samples, errors, statuses, login_ms = [], {}, {}, []
+        tasks = [asyncio.create_task(route_sampler(client, token, stop, samples, errors)) for _ in range(samplers)]
+        tasks += [asyncio.create_task(login_client(client, stop, statuses, login_ms)) for _ in range(logins)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        # In-flight requests still finish
+        await asyncio.gather(*tasks)
+    return samples, errors, statuses, login_ms, time.perf_counter() - started
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:9999")
+    parser.add_argument("--samplers", type=int, default=4, help="Clients calling the regular routes")
+    parser.add_argument("--logins", type=int, default=200, help="Concurrent login clients during the storm")
+    parser.add_argument("--seconds", type=float, default=15)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = await get_token(client)
+
+    print(f"🚀 Baseline: {args.samplers} clients on {', '.join(ROUTES)} for {args.seconds:.0f}s")
+    baseline, base_errors, _, _, _ = await phase(args.base_url, token, args.samplers, 0, args.seconds)
+
+    print(f"🚀 Storm: same clients + {args.logins} concurrent logins for {args.seconds:.0f}s")
+    storm, storm_errors, statuses, login_ms, storm_seconds = await phase(args.base_url, token, args.samplers, args.logins, args.seconds)
+
+    print("\nOther routes")
+    report("baseline", baseline)
+    report("during login storm", storm)
+    if base_errors or storm_errors:
+        print(f"   errors: baseline {base_errors}, storm {storm_errors}")
+
+    print("\nLogins")
+    ok = statuses.get(200, 0)
+    print(f"   responses: {dict(sorted(statuses.items(), key=str))}")
+    print(f"   successful logins/s: {ok / storm_seconds:.1f}")
+    report("login latency (all)", login_ms)
+    if baseline and storm:
+        print(f"\n   p99 other routes: {percentile(baseline, 0.99):.1f} ms -> {percentile(storm, 0.99):.1f} ms "
+              f"(median {statistics.median(baseline):.1f} -> {statistics.median(storm):.1f} ms)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,22 @@
+from app.utils.phone_numbers import normalized_phones, phone_list, primary_phone
+
+def test_json_list():
+    assert normalized_phones(["(804) 555-0100", "804-555-0101"]) == ["+18045550100", "+18045550101"]
+    assert normalized_phones('["(804) 555-0100"]') == ["+18045550100"]
+
+def test_legacy_python_literal_string():
+    # Older rows stored str(list) instead of JSON
+    legacy = "['(804) 555-0100', '+1 804-555-0101']"
+    assert phone_list(legacy) == ["(804) 555-0100", "+1 804-555-0101"]
+    assert normalized_phones(legacy) == ["+18045550100", "+18045550101"]
+    assert primary_phone(legacy) == "(804) 555-0100"
+
+def test_bare_number_kept_as_stored():
+    assert phone_list("+44 20 7946 0958") == ["+44 20 7946 0958"]
+    assert phone_list("8045550100") == ["8045550100"]
+    assert normalized_phones("+442079460958") == ["+442079460958"]
+
+def test_empty_values():
+    assert phone_list(None) == []
+    assert phone_list("") == []
+    assert primary_phone("[]") is None